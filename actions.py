@@ -2,12 +2,16 @@
 
 from typing import TYPE_CHECKING, Optional, Tuple
 
+from entity import Item
 import color
 import exceptions
+import tile_types
 
 if TYPE_CHECKING:
     from engine import Engine
-    from entity import Actor, Entity, Item
+    from entity import Actor, Entity
+
+MELEE_NOISE_RADIUS = 8  # Dormant actors this close to a fight are woken by it.
 
 
 class Action:
@@ -43,12 +47,12 @@ def perform(self) -> None:
         actor_location_y = self.entity.y
         inventory = self.entity.inventory
 
-        for item in self.engine.game_map.items:
-            if actor_location_x == item.x and actor_location_y == item.y:
+        for item in self.engine.game_map.get_entities_at_location(actor_location_x, actor_location_y):
+            if isinstance(item, Item):
                 if len(inventory.items) >= inventory.capacity:
                     raise exceptions.Impossible("Your inventory is full.")
 
-                self.engine.game_map.entities.remove(item)
+                self.engine.game_map.remove_entity(item)
                 item.parent = self.entity.inventory
                 inventory.items.append(item)
 
@@ -157,6 +161,7 @@ def perform(self) -> None:
             target.fighter.hp -= damage
         else:
             self.engine.message_log.add_message(f"{attack_desc} but does no damage.", attack_color)
+        self.engine.game_map.wake_actors_near(target.x, target.y, MELEE_NOISE_RADIUS)
 
 
 class MovementAction(ActionWithDirection):
@@ -166,10 +171,10 @@ def perform(self) -> None:
         if not self.engine.game_map.in_bounds(dest_x, dest_y):
             # Destination is out of bounds.
             raise exceptions.Impossible("That way is blocked.")
-        if not self.engine.game_map.tiles["walkable"][dest_x, dest_y]:
+        if not tile_types.TILES["walkable"][self.engine.game_map.tiles[dest_x, dest_y]]:
             # Destination is blocked by a tile.
             raise exceptions.Impossible("That way is blocked.")
-        if self.engine.game_map.get_blocking_entity_at_location(dest_x, dest_y):
+        if self.engine.game_map.blocked[dest_x, dest_y]:
             # Destination is blocked by an entity.
             raise exceptions.Impossible("That way is blocked.")
 
@@ -0,0 +1,89 @@
+"""Saving of the game as it is played, without stopping play."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+import concurrent.futures
+import time
+import traceback
+
+from metrics import metrics
+import journal
+import save_format
+
+if TYPE_CHECKING:
+    from engine import Engine
+
+
+class Autosave:
+    """Keeps the save file of the current game, its Engine.save_filename, up to date.
+
+    Every command given by the player is appended to the journal of the save file, and every `interval` turns a
+    checkpoint of the whole game is written over the save file, after which the journal only has to hold the commands
+    given since. Only the snapshot of the engine is taken on the main thread, the checkpoint is written by a background
+    thread.
+    """
+
+    def __init__(self, interval: int = 100, codec: str = save_format.DEFAULT_CODEC):
+        self.interval = interval  # Turns between checkpoints, 0 disables autosaving.
+        self.codec = codec  # The name of the codec checkpoints are compressed with, from save_format.CODECS.
+        self.journal: Optional[journal.Journal] = None  # The journal of the engine being autosaved.
+        self._engine: Optional[Engine] = None  # The engine being autosaved.
+        self._last_saved_turn = 0
+        self._writer = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="autosave")
+        self._pending: Optional[concurrent.futures.Future[None]] = None
+        self._pending_command_count = 0  # The Engine.command_count of the checkpoint being written.
+
+    def update(self, engine: Engine) -> None:
+        """Autosave if `interval` turns have passed since the last autosave."""
+        if self._pending is not None and self._pending.done():
+            self.wait()
+        if not self.interval or not engine.player.is_alive or engine.save_filename is None:
+            return
+        if engine is not self._engine:
+            self.start(engine)
+        elif engine.turn_count - self._last_saved_turn >= self.interval:
+            self.save(engine)
+
+    def start(self, engine: Engine) -> None:
+        """Start journaling a new or loaded game, with a checkpoint of its current state unless it was just loaded."""
+        self.wait()
+        if self._engine is not None:
+            self._engine.journal = None
+        self._engine = engine
+        self._last_saved_turn = engine.turn_count
+        assert engine.save_filename is not None
+        self.journal = journal.Journal(journal.journal_filename(engine.save_filename))
+        saved = self.journal.start(engine)
+        engine.journal = self.journal
+        if not saved:
+            self.save(engine)
+
+    def save(self, engine: Engine) -> None:
+        """Snapshot the engine and write it in the background, the time the game was blocked for is reported."""
+        assert engine.save_filename is not None
+        start = time.perf_counter()
+        self.wait()  # Saves are written in order, the previous one must finish first.
+        snapshot = save_format.take_snapshot(engine)
+        blocked = time.perf_counter() - start
+        metrics.add_time("autosave.main_thread_blocked", blocked)
+        print(f"Autosaving on turn {engine.turn_count}, the game was blocked for {blocked * 1e3:.1f}ms.")
+
+        self._last_saved_turn = engine.turn_count
+        self._pending_command_count = engine.command_count
+        self._pending = self._writer.submit(save_format.write_snapshot, snapshot, engine.save_filename, self.codec)
+
+    def wait(self) -> None:
+        """Wait for the autosave in progress to be written, this must be done before saving to the same file.
+
+        Once the checkpoint is written the journal entries it includes are removed.
+        """
+        if self._pending is None:
+            return
+        try:
+            self._pending.result()
+        except Exception:
+            traceback.print_exc()  # A failed autosave must not prevent the next save.
+        else:
+            if self.journal is not None and self._engine is not None and self._engine.journal is self.journal:
+                self.journal.truncate(self._pending_command_count)
+        self._pending = None
@@ -0,0 +1,4 @@
+"""Standalone performance benchmarks.
+
+Each module can be run from the project root, for example: `python -m benchmarks.entity_lookup`
+"""
@@ -0,0 +1,35 @@
+"""Compare the time the game is blocked by an autosave against saving on the main thread."""
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+
+from autosave import Autosave
+from benchmarks.common import WORLDS, format_seconds, new_world
+import save_format
+
+
+def main() -> None:
+    print(f"{'map':>10} {'save_as':>12} {'autosave':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "savegame.sav")
+        for width, height, max_rooms in WORLDS:
+            engine = new_world(width, height, max_rooms)
+
+            start = time.perf_counter()
+            save_format.save_engine(engine, filename)
+            blocking_save = time.perf_counter() - start
+
+            engine.save_filename = filename
+            autosave = Autosave()
+            start = time.perf_counter()
+            autosave.save(engine)
+            blocked = time.perf_counter() - start
+            autosave.wait()
+
+            print(f"{f'{width}x{height}':>10} {format_seconds(blocking_save):>12} {format_seconds(blocked):>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Helpers shared between the benchmarks."""
+from __future__ import annotations
+
+from typing import Callable
+import time
+
+from engine import Engine
+from game_map import GameMap, GameWorld
+import entity_factories
+import procgen
+
+# Map sizes and the number of room attempts on each, scaled with the map area.
+WORLDS = [(80, 43, 30), (500, 500, 2_000), (2000, 2000, 8_000)]
+
+
+def new_engine(map_width: int = 80, map_height: int = 43) -> Engine:
+    """Return an Engine with an empty map of the given size, the player is not placed on the map."""
+    engine = Engine(player=entity_factories.player.build())
+    engine.game_world = GameWorld(
+        engine=engine,
+        map_width=map_width,
+        map_height=map_height,
+        max_rooms=30,
+        room_min_size=6,
+        room_max_size=10,
+        seed=0,
+    )
+    engine.game_map = GameMap(engine, map_width, map_height)
+    return engine
+
+
+def new_world(map_width: int, map_height: int, max_rooms: int, floor_number: int = 7) -> Engine:
+    """Return an Engine on a generated floor of the given size, with part of the map explored and a long message log."""
+    engine = new_engine(map_width, map_height)
+    engine.game_world.max_rooms = max_rooms
+    engine.game_world.current_floor = floor_number
+    engine.game_map = procgen.build_dungeon(engine.game_world._plan_floor(floor_number), engine)
+    engine.game_map.explored[: map_width // 2] = engine.game_map.walkable[: map_width // 2]
+    engine.update_fov()
+    for i in range(1_000):
+        engine.message_log.add_message(f"The Orc attacks you for {i % 7} hit points.")
+    return engine
+
+
+def time_per_call(func: Callable[[], object], number: int) -> float:
+    """Call `func` `number` times and return the average time of one call in seconds."""
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return (time.perf_counter() - start) / number
+
+
+def format_seconds(seconds: float) -> str:
+    """Return a human readable duration."""
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.2f}us"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds:.2f}s"
@@ -0,0 +1,48 @@
+"""Compare the GameMap spatial index against a linear scan of every entity."""
+from __future__ import annotations
+
+from typing import Optional
+import random
+
+from benchmarks.common import format_seconds, new_engine, time_per_call
+from entity import Entity
+from game_map import GameMap
+
+
+def linear_blocking_entity_at_location(game_map: GameMap, x: int, y: int) -> Optional[Entity]:
+    """The old lookup, which checked every entity on the map."""
+    for entity in game_map.entities:
+        if entity.blocks_movement and entity.x == x and entity.y == y:
+            return entity
+    return None
+
+
+def main() -> None:
+    rng = random.Random(0)
+    print(f"{'entities':>10} {'linear scan':>14} {'spatial index':>14} {'speedup':>10}")
+    for entity_count in (10, 1_000, 100_000):
+        size = max(20, int((entity_count * 2) ** 0.5))
+        game_map = new_engine(size, size).game_map
+        for _ in range(entity_count):
+            Entity(game_map, rng.randrange(size), rng.randrange(size), blocks_movement=True)
+        queries = [(rng.randrange(size), rng.randrange(size)) for _ in range(100)]
+        number = max(1, 100_000 // entity_count)
+
+        def linear() -> None:
+            for x, y in queries:
+                linear_blocking_entity_at_location(game_map, x, y)
+
+        def indexed() -> None:
+            for x, y in queries:
+                game_map.get_blocking_entity_at_location(x, y)
+
+        linear_time = time_per_call(linear, number) / len(queries)
+        indexed_time = time_per_call(indexed, number * 10) / len(queries)
+        print(
+            f"{entity_count:>10} {format_seconds(linear_time):>14} {format_seconds(indexed_time):>14}"
+            f" {linear_time / indexed_time:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Compare computing the FOV over the whole map against the radius bounded window used by Engine.update_fov."""
+from __future__ import annotations
+
+import random
+
+from tcod.map import compute_fov
+
+from benchmarks.common import format_seconds, new_engine, time_per_call
+from engine import Engine
+import tile_types
+
+
+def new_cave(width: int, height: int) -> Engine:
+    """Return an engine on an open map with walls scattered around, the player is in the middle."""
+    rng = random.Random(0)
+    engine = new_engine(width, height)
+    game_map = engine.game_map
+    game_map.tiles[1:-1, 1:-1] = tile_types.floor
+    for _ in range(width * height // 10):
+        game_map.tiles[rng.randrange(1, width - 1), rng.randrange(1, height - 1)] = tile_types.wall
+    game_map.on_tiles_changed()
+    engine.player.place(width // 2, height // 2, game_map)
+    return engine
+
+
+def main() -> None:
+    print(f"{'map size':>10} {'whole map':>14} {'window':>14} {'speedup':>10}")
+    for width, height in ((80, 43), (500, 500), (1000, 1000), (2000, 2000)):
+        engine = new_cave(width, height)
+        game_map = engine.game_map
+        player = engine.player
+
+        def whole_map() -> None:
+            game_map.visible[:] = compute_fov(game_map.transparent, (player.x, player.y), radius=engine.fov_radius)
+            game_map.explored |= game_map.visible
+
+        def window() -> None:
+            game_map.fov_key = None  # Force a recompute.
+            engine.update_fov()
+
+        number = max(1, 1_000_000 // (width * height))
+        whole_map_time = time_per_call(whole_map, number)
+        window_time = time_per_call(window, number)
+        print(
+            f"{width:>5}x{height:<4} {format_seconds(whole_map_time):>14} {format_seconds(window_time):>14}"
+            f" {whole_map_time / window_time:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
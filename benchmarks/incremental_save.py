@@ -0,0 +1,55 @@
+"""Compare saving the whole game against appending the commands since the last checkpoint to the journal."""
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+
+from actions import WaitAction
+from benchmarks.common import WORLDS, format_seconds, new_world
+from metrics import metrics
+import input_handlers
+import journal
+import save_format
+import setup_game
+
+COMMAND_COUNT = 100  # Commands given between the checkpoint and the save.
+
+
+def main() -> None:
+    print(f"{'map':>10} {'full save':>12} {'append':>12} {'journal save':>14} {'replay load':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "savegame.sav")
+        for width, height, max_rooms in WORLDS:
+            engine = new_world(width, height, max_rooms)
+            save_format.save_engine(engine, filename)
+            engine.journal = journal.Journal(journal.journal_filename(filename))
+            engine.journal.start(engine)
+            handler = input_handlers.EventHandler(engine)
+            metrics.reset()
+            for _ in range(COMMAND_COUNT):
+                handler.handle_action(WaitAction(engine.player))
+
+            append = metrics.timings["journal.append"] / metrics.counters["journal.append"]
+
+            start = time.perf_counter()
+            save_format.save_engine(engine, f"{filename}.full")
+            full_save = time.perf_counter() - start
+
+            start = time.perf_counter()
+            engine.journal.sync()
+            journal_save = time.perf_counter() - start
+
+            start = time.perf_counter()
+            setup_game.load_game(filename)
+            replay_load = time.perf_counter() - start
+
+            print(
+                f"{f'{width}x{height}':>10} {format_seconds(full_save):>12} {format_seconds(append):>12}"
+                f" {format_seconds(journal_save):>14}"
+                f" {format_seconds(replay_load):>12}"
+            )
+
+
+if __name__ == "__main__":
+    main()
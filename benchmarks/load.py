@@ -0,0 +1,40 @@
+"""Compare the time to the first frame after loading a game, with the map memory mapped and read into memory."""
+from __future__ import annotations
+
+from typing import Tuple
+import os
+import tempfile
+import time
+
+from tcod.console import Console
+
+from benchmarks.common import WORLDS, format_seconds, new_world
+import save_format
+
+
+def time_to_first_frame(filename: str, memory_map: bool) -> Tuple[float, float]:
+    """Return the time taken to load the game in `filename`, and the time until its first frame was rendered."""
+    start = time.perf_counter()
+    engine = save_format.load_engine(filename, memory_map=memory_map)
+    loaded = time.perf_counter() - start
+    console = Console(max(80, engine.game_map.width), max(50, engine.game_map.height), order="F")
+    engine.render(console)
+    return loaded, time.perf_counter() - start
+
+
+def main() -> None:
+    print(f"{'map':>10} {'map arrays':>12} {'load':>10} {'first frame':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "savegame.sav")
+        for width, height, max_rooms in WORLDS:
+            save_format.save_engine(new_world(width, height, max_rooms), filename)
+            for name, memory_map in [("read", False), ("memmap", True)]:
+                loaded, first_frame = time_to_first_frame(filename, memory_map)
+                print(
+                    f"{f'{width}x{height}':>10} {name:>12} {format_seconds(loaded):>10}"
+                    f" {format_seconds(first_frame):>12}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Report the memory used by each entity and message, with `__slots__` and with a `__dict__` per instance.
+
+The dict backed objects are made by copying every attribute of the real objects into plain instances, which is how
+these classes were stored before they used `__slots__`.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List
+import copy
+import tracemalloc
+
+from components.ai import BaseAI
+from message_log import Message
+from slotted import Slotted
+import color
+import entity_factories
+
+COPY_COUNT = 10_000
+
+
+class DictBacked:
+    """A plain object which holds its attributes in a `__dict__`."""
+
+
+def dict_backed(obj: Any, memo: Dict[int, Any]) -> Any:
+    """Return a copy of `obj` where every slotted object it refers to is replaced with a DictBacked object."""
+    if id(obj) in memo:
+        return memo[id(obj)]
+    if isinstance(obj, list):
+        result: Any = memo.setdefault(id(obj), [])
+        result.extend(dict_backed(item, memo) for item in obj)
+        return result
+    if not isinstance(obj, (Slotted, BaseAI)):
+        return obj  # Values such as ints, strings, tuples and enums are shared.
+    result = memo.setdefault(id(obj), DictBacked())
+    attributes = dict(vars(obj)) if hasattr(obj, "__dict__") else {}
+    for cls in type(obj).__mro__:
+        for name in cls.__dict__.get("__slots__", ()):
+            if hasattr(obj, name):
+                attributes[name] = getattr(obj, name)
+    for name, value in attributes.items():
+        setattr(result, name, dict_backed(value, memo))
+    return result
+
+
+def bytes_per_copy(prototype: Any) -> float:
+    """Return the average memory in bytes held by one deep copy of `prototype`, measured with tracemalloc."""
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    copies: List[Any] = [copy.deepcopy(prototype) for _ in range(COPY_COUNT)]
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del copies
+    return (end - start) / COPY_COUNT
+
+
+def main() -> None:
+    prototypes = {
+        "Orc": entity_factories.orc.build(),
+        "Health Potion": entity_factories.health_potion.build(),
+        "Chain Mail": entity_factories.chain_mail.build(),
+        "Message": Message("The Orc attacks you for 3 hit points.", color.enemy_atk),
+    }
+    print(f"{'object':>16} {'__dict__':>12} {'__slots__':>12} {'saved':>8}")
+    for name, prototype in prototypes.items():
+        dict_bytes = bytes_per_copy(dict_backed(prototype, {}))
+        slots_bytes = bytes_per_copy(prototype)
+        print(f"{name:>16} {dict_bytes:>11.0f}B {slots_bytes:>11.0f}B {1 - slots_bytes / dict_bytes:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Measure frame times of the message log and the history viewer with and without the wrapped line cache."""
+from __future__ import annotations
+
+from typing import Reversible
+
+from tcod.console import Console
+
+from benchmarks.common import format_seconds, new_world, time_per_call
+from message_log import Message, MessageLog
+import color
+
+
+def render_uncached(console: Console, x: int, y: int, width: int, height: int, messages: Reversible[Message]) -> None:
+    """The old MessageLog.render_messages, which wrapped every rendered message on each frame."""
+    y_offset = height - 1
+    for message in reversed(messages):
+        for line in reversed(list(MessageLog.wrap(message.full_text, width))):
+            console.print(x=x, y=y + y_offset, string=line, fg=message.fg)
+            y_offset -= 1
+            if y_offset < 0:
+                return
+
+
+def main() -> None:
+    messages = new_world(80, 43, 30).message_log.messages
+    for i in range(200):
+        messages.append(Message(f"You pick up the Scroll of Lightning number {i}, it glows faintly.", color.white))
+    console = Console(80, 50, order="F")
+    areas = [("message log", 21, 45, 40, 5), ("history viewer", 1, 1, 72, 42)]
+
+    print(f"{'area':>16} {'uncached':>10} {'cached':>10}")
+    for name, x, y, width, height in areas:
+        uncached = time_per_call(lambda: render_uncached(console, x, y, width, height, messages), 2000)
+        cached = time_per_call(lambda: MessageLog.render_messages(console, x, y, width, height, messages), 2000)
+        print(f"{name:>16} {format_seconds(uncached):>10} {format_seconds(cached):>10}")
+
+
+if __name__ == "__main__":
+    main()
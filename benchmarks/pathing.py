@@ -0,0 +1,88 @@
+"""Compare per-monster pathfinding against the shared player flow field."""
+from __future__ import annotations
+
+from typing import List
+import random
+import time
+
+from benchmarks.common import format_seconds, new_engine
+from components.ai import BaseAI
+from engine import Engine
+from metrics import metrics
+import entity_factories
+import tile_types
+
+MAP_SIZE = 300
+
+
+def new_cave(hostile_count: int) -> Engine:
+    """Return an engine on a large open map with walls scattered around and `hostile_count` orcs."""
+    rng = random.Random(0)
+    engine = new_engine(MAP_SIZE, MAP_SIZE)
+    game_map = engine.game_map
+    game_map.tiles[1:-1, 1:-1] = tile_types.floor
+    for _ in range(MAP_SIZE * MAP_SIZE // 10):
+        game_map.tiles[rng.randrange(1, MAP_SIZE - 1), rng.randrange(1, MAP_SIZE - 1)] = tile_types.wall
+    game_map.on_tiles_changed()
+
+    engine.player.place(MAP_SIZE // 2, MAP_SIZE // 2, game_map)
+    game_map.tiles[MAP_SIZE // 2, MAP_SIZE // 2] = tile_types.floor
+    while len(game_map.entities) <= hostile_count:
+        x, y = rng.randrange(1, MAP_SIZE - 1), rng.randrange(1, MAP_SIZE - 1)
+        if tile_types.TILES["walkable"][game_map.tiles[x, y]] and not game_map.get_entities_at_location(x, y):
+            entity_factories.orc.spawn(game_map, x, y)
+    return engine
+
+
+def hostile_ais(engine: Engine) -> List[BaseAI]:
+    return [actor.ai for actor in engine.game_map.actors if actor is not engine.player and actor.ai]
+
+
+def time_per_monster_paths(engine: Engine) -> float:
+    """Return the time taken for every monster to compute its own path to the player."""
+    player = engine.player
+    start = time.perf_counter()
+    for ai in hostile_ais(engine):
+        ai.get_path_to(player.x, player.y)
+    return time.perf_counter() - start
+
+
+def time_flow_field_paths(engine: Engine) -> float:
+    """Return the time taken to build the flow field and then read every monsters path from it."""
+    start = time.perf_counter()
+    for ai in hostile_ais(engine):
+        ai.get_path_to_player()
+    elapsed = time.perf_counter() - start
+    engine._player_flow_field = None  # Normally done by Engine.handle_enemy_turns.
+    return elapsed
+
+
+def main() -> None:
+    print(f"Pathing for one enemy turn on a {MAP_SIZE}x{MAP_SIZE} map.")
+    print("Cost array and flow field builds are counted by the path metrics, for per-monster/flow field paths.")
+    print(
+        f"{'hostiles':>10} {'per-monster':>14} {'flow field':>14} {'speedup':>10}"
+        f" {'cost builds':>12} {'flow builds':>12}"
+    )
+    for hostile_count in (10, 100, 1_000):
+        engine = new_cave(hostile_count)
+        times = []
+        cost_builds = []
+        flow_field_builds = []
+        for time_paths in (time_per_monster_paths, time_flow_field_paths):
+            metrics.reset()
+            engine.game_map.on_tiles_changed()  # Start each mode without a cost array.
+            engine.game_map.get_path_cost()  # Exclude the shared cost array from both timings.
+            times.append(time_paths(engine))
+            cost_builds.append(metrics.counters.get("path.cost_builds", 0))
+            flow_field_builds.append(metrics.counters.get("path.flow_field_builds", 0))
+        per_monster, flow_field = times
+        print(
+            f"{hostile_count:>10} {format_seconds(per_monster):>14} {format_seconds(flow_field):>14}"
+            f" {per_monster / flow_field:>9.1f}x {'/'.join(map(str, cost_builds)):>12}"
+            f" {'/'.join(map(str, flow_field_builds)):>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Measure dungeon generation time for small to huge floors."""
+from __future__ import annotations
+
+from typing import Iterator, Tuple
+import random
+import time
+
+import tcod
+
+from benchmarks.common import WORLDS, format_seconds, new_engine
+import procgen
+import tile_types
+
+
+def old_tunnel_between(start: Tuple[int, int], end: Tuple[int, int]) -> Iterator[Tuple[int, int]]:
+    """The old tunnel_between, which yielded one coordinate at a time."""
+    x1, y1 = start
+    x2, y2 = end
+    if random.random() < 0.5:
+        corner_x, corner_y = x2, y1
+    else:
+        corner_x, corner_y = x1, y2
+    for x, y in tcod.los.bresenham((x1, y1), (corner_x, corner_y)).tolist():
+        yield x, y
+    for x, y in tcod.los.bresenham((corner_x, corner_y), (x2, y2)).tolist():
+        yield x, y
+
+
+def time_tunnels(width: int, height: int) -> Tuple[float, float]:
+    """Return the time to dig 1,000 random tunnels one cell at a time, and with index arrays."""
+    game_map = new_engine(width, height).game_map
+    rng = random.Random(0)
+    points = [
+        ((rng.randrange(width), rng.randrange(height)), (rng.randrange(width), rng.randrange(height)))
+        for _ in range(1000)
+    ]
+
+    start = time.perf_counter()
+    for a, b in points:
+        for x, y in old_tunnel_between(a, b):
+            game_map.tiles[x, y] = tile_types.floor
+    per_cell = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for a, b in points:
+        game_map.tiles[procgen.tunnel_between(a, b, rng)] = tile_types.floor
+    vectorized = time.perf_counter() - start
+    return per_cell, vectorized
+
+
+def main() -> None:
+    print(f"{'map size':>10} {'rooms':>6} {'generate':>10} {'1k tunnels, per cell':>22} {'vectorized':>12}")
+    for width, height, max_rooms in WORLDS:
+        engine = new_engine(width, height)
+        engine.game_world.current_floor = 1
+        start = time.perf_counter()
+        procgen.generate_dungeon(
+            max_rooms=max_rooms,
+            room_min_size=6,
+            room_max_size=10,
+            map_width=width,
+            map_height=height,
+            engine=engine,
+        )
+        generate = time.perf_counter() - start
+        per_cell, vectorized = time_tunnels(width, height)
+        print(
+            f"{width:>5}x{height:<4} {max_rooms:>6} {format_seconds(generate):>10}"
+            f" {format_seconds(per_cell):>22} {format_seconds(vectorized):>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Measure frame times of GameMap.render with and without its caches."""
+from __future__ import annotations
+
+from tcod.console import Console
+import numpy as np
+
+from benchmarks.common import format_seconds, time_per_call
+from game_map import GameMap
+import actions
+import setup_game
+import tile_types
+
+
+def render_uncached(game_map: GameMap, console: Console) -> None:
+    """The old GameMap.render, which redrew every tile and every entity on each frame."""
+    console.rgb[0 : game_map.width, 0 : game_map.height] = np.select(
+        condlist=[game_map.visible, game_map.explored],
+        choicelist=[tile_types.TILES["light"][game_map.tiles], tile_types.TILES["dark"][game_map.tiles]],
+        default=tile_types.SHROUD,
+    )
+    for entity in sorted(game_map.entities, key=lambda x: x.render_order.value):
+        if game_map.visible[entity.x, entity.y]:
+            console.print(x=entity.x, y=entity.y, string=entity.char, fg=entity.color)
+
+
+def main() -> None:
+    engine = setup_game.new_game()
+    game_map = engine.game_map
+    console = Console(80, 50, order="F")
+
+    def after_turn() -> None:
+        """A full turn followed by a frame, as if the player moved."""
+        actions.WaitAction(engine.player).perform()
+        engine.handle_enemy_turns()
+        game_map.fov_key = None  # Force a recompute, as if the player had moved.
+        engine.update_fov()
+        console.clear()
+        game_map.render(console)
+
+    def idle() -> None:
+        console.clear()
+        game_map.render(console)
+
+    def uncached() -> None:
+        console.clear()
+        render_uncached(game_map, console)
+
+    idle()  # Build the caches.
+    print(f"Frame times for a {game_map.width}x{game_map.height} map.")
+    print(f"clear only:              {format_seconds(time_per_call(console.clear, 2000))}")
+    print(f"uncached render:         {format_seconds(time_per_call(uncached, 2000))}")
+    print(f"cached render, idle:     {format_seconds(time_per_call(idle, 2000))}")
+    print(f"turn, FOV and rendering: {format_seconds(time_per_call(after_turn, 2000))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Compare the room overlap tests used by dungeon generation as the number of rooms grows."""
+from __future__ import annotations
+
+from typing import List
+import random
+import time
+
+import numpy as np
+
+from benchmarks.common import format_seconds
+from procgen import RectangularRoom
+
+MAP_WIDTH, MAP_HEIGHT = 2000, 2000
+
+
+def random_rooms(max_rooms: int) -> List[RectangularRoom]:
+    """Return room candidates the same way generate_dungeon creates them."""
+    rng = random.Random(0)
+    candidates = []
+    for _ in range(max_rooms):
+        room_width = rng.randint(6, 10)
+        room_height = rng.randint(6, 10)
+        x = rng.randint(0, MAP_WIDTH - room_width - 1)
+        y = rng.randint(0, MAP_HEIGHT - room_height - 1)
+        candidates.append(RectangularRoom(x, y, room_width, room_height))
+    return candidates
+
+
+def place_with_pairwise_tests(candidates: List[RectangularRoom]) -> List[RectangularRoom]:
+    """The old method, checking each candidate against every accepted room."""
+    rooms: List[RectangularRoom] = []
+    for new_room in candidates:
+        if any(new_room.intersects(other_room) for other_room in rooms):
+            continue
+        rooms.append(new_room)
+    return rooms
+
+
+def place_with_bitmap(candidates: List[RectangularRoom]) -> List[RectangularRoom]:
+    """The method used by generate_dungeon, checking each candidate against a bitmap of the accepted rooms."""
+    rooms: List[RectangularRoom] = []
+    occupied = np.zeros((MAP_WIDTH, MAP_HEIGHT), dtype=bool, order="F")
+    for new_room in candidates:
+        if occupied[new_room.outer].any():
+            continue
+        occupied[new_room.outer] = True
+        rooms.append(new_room)
+    return rooms
+
+
+def main() -> None:
+    print(f"Room placement on a {MAP_WIDTH}x{MAP_HEIGHT} map.")
+    print(f"{'max_rooms':>10} {'pairwise':>12} {'bitmap':>12} {'speedup':>10}")
+    for max_rooms in (30, 100, 1_000, 10_000):
+        candidates = random_rooms(max_rooms)
+
+        start = time.perf_counter()
+        pairwise_rooms = place_with_pairwise_tests(candidates)
+        pairwise = time.perf_counter() - start
+
+        start = time.perf_counter()
+        bitmap_rooms = place_with_bitmap(candidates)
+        bitmap = time.perf_counter() - start
+
+        assert pairwise_rooms == bitmap_rooms, "Both methods must accept the same rooms."
+        print(f"{max_rooms:>10} {format_seconds(pairwise):>12} {format_seconds(bitmap):>12} {pairwise / bitmap:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
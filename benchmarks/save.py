@@ -0,0 +1,61 @@
+"""Compare the save file format against pickling the whole Engine and compressing it with lzma."""
+from __future__ import annotations
+
+from typing import Callable, Tuple
+import lzma
+import os
+import pickle
+import tempfile
+import time
+
+from benchmarks.common import WORLDS, format_seconds, new_world
+from engine import Engine
+import save_format
+
+
+def pickle_save(engine: Engine, filename: str) -> None:
+    """The old Engine.save_as."""
+    with open(filename, "wb") as f:
+        f.write(lzma.compress(pickle.dumps(engine)))
+
+
+def pickle_load(filename: str) -> Engine:
+    """The old setup_game.load_game."""
+    with open(filename, "rb") as f:
+        engine = pickle.loads(lzma.decompress(f.read()))
+    assert isinstance(engine, Engine)
+    return engine
+
+
+def time_save_and_load(
+    engine: Engine, save: Callable[[Engine, str], None], load: Callable[[str], Engine]
+) -> Tuple[float, float, int]:
+    """Return the time taken to save and then load `engine`, and the size of the file."""
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "savegame.sav")
+        start = time.perf_counter()
+        save(engine, filename)
+        save_time = time.perf_counter() - start
+        start = time.perf_counter()
+        load(filename)
+        load_time = time.perf_counter() - start
+        return save_time, load_time, os.path.getsize(filename)
+
+
+def main() -> None:
+    print(f"{'map':>10} {'format':>14} {'save':>10} {'load':>10} {'size':>10}")
+    for width, height, max_rooms in WORLDS:
+        engine = new_world(width, height, max_rooms)
+        for name, save, load in [
+            ("pickle+lzma", pickle_save, pickle_load),
+            ("save_format", save_format.save_engine, save_format.load_engine),
+        ]:
+            save_time, load_time, size = time_save_and_load(engine, save, load)
+            print(
+                f"{f'{width}x{height}':>10} {name:>14} {format_seconds(save_time):>10}"
+                f" {format_seconds(load_time):>10} {size / 1024:>8.0f}KB"
+            )
+
+
+if __name__ == "__main__":
+    main()
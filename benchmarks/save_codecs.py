@@ -0,0 +1,34 @@
+"""Report the size, save time and load time of each save codec on small, medium and huge worlds.
+
+Codecs can be picked by name on the command line, by default a few levels of each kind of codec are compared.
+"""
+from __future__ import annotations
+
+import sys
+
+from benchmarks.common import WORLDS, format_seconds, new_world
+from benchmarks.save import time_save_and_load
+import save_format
+
+BENCHMARKED_CODECS = ["none", "zlib-1", "zlib-6", "zlib-9", "bz2-1", "bz2-9", "lzma-0", "lzma-6", "lzma-9"]
+
+
+def main() -> None:
+    codecs = sys.argv[1:] or BENCHMARKED_CODECS
+    print(f"{'map':>10} {'codec':>8} {'save':>10} {'load':>10} {'size':>10}")
+    for width, height, max_rooms in WORLDS:
+        engine = new_world(width, height, max_rooms)
+        for codec in codecs:
+            save_time, load_time, size = time_save_and_load(
+                engine,
+                lambda engine, filename: save_format.save_engine(engine, filename, codec),
+                save_format.load_engine,
+            )
+            print(
+                f"{f'{width}x{height}':>10} {codec:>8} {format_seconds(save_time):>10}"
+                f" {format_seconds(load_time):>10} {size / 1024:>8.0f}KB"
+            )
+
+
+if __name__ == "__main__":
+    main()
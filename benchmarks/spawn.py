@@ -0,0 +1,56 @@
+"""Compare spawning entities from templates against deep copying prototype entities."""
+from __future__ import annotations
+
+from typing import Callable, List
+import copy
+import time
+
+from benchmarks.common import format_seconds, new_engine
+from entity import Entity
+from entity_templates import EntityTemplate
+from game_map import GameMap
+import entity_factories
+
+SPAWN_COUNT = 1_000
+
+
+def deepcopy_spawn(prototype: Entity, gamemap: GameMap, x: int, y: int) -> Entity:
+    """The old spawn, which deep copied a prototype entity and all of its components."""
+    clone = copy.deepcopy(prototype)
+    clone.place(x, y, gamemap)
+    return clone
+
+
+def time_spawns(spawn: Callable[[GameMap, int, int], object], rounds: int = 10) -> float:
+    """Return the average time taken to spawn one entity, each round spawns a row of entities onto a new map."""
+    elapsed = 0.0
+    for _ in range(rounds):
+        game_map = new_engine(SPAWN_COUNT, 1).game_map
+        start = time.perf_counter()
+        for x in range(SPAWN_COUNT):
+            spawn(game_map, x, 0)
+        elapsed += time.perf_counter() - start
+    return elapsed / (rounds * SPAWN_COUNT)
+
+
+def main() -> None:
+    print(f"{'entity':>18} {'deepcopy':>12} {'template':>12} {'speedup':>10}")
+    templates: List[EntityTemplate] = [
+        entity_factories.orc,
+        entity_factories.troll,
+        entity_factories.health_potion,
+        entity_factories.fireball_scroll,
+        entity_factories.chain_mail,
+    ]
+    for template in templates:
+        prototype = template.build()
+        deepcopy_time = time_spawns(lambda gamemap, x, y: deepcopy_spawn(prototype, gamemap, x, y))
+        template_time = time_spawns(template.spawn)
+        print(
+            f"{template.name:>18} {format_seconds(deepcopy_time):>12} {format_seconds(template_time):>12}"
+            f" {deepcopy_time / template_time:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
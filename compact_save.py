@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""Compact saved games into new checkpoints which include every command in their journals, and empty the journals."""
+import argparse
+
+import journal
+import save_format
+import save_slots
+import setup_game
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("filenames", nargs="*", help="The save files to compact, every saved game by default.")
+    parser.add_argument(
+        "--codec",
+        choices=save_format.CODECS,
+        default=save_format.DEFAULT_CODEC,
+        help=f"How to compress the new checkpoints, {save_format.DEFAULT_CODEC} by default.",
+    )
+    args = parser.parse_args()
+
+    for filename in args.filenames or [slot.filename for slot in save_slots.list_slots()]:
+        engine = setup_game.load_game(filename)
+        save_format.unmap_save_file(engine.game_map)
+        engine.save_as(filename, args.codec)
+        journal.Journal(journal.journal_filename(filename)).truncate(engine.command_count)
+        print(f"Compacted {filename} on turn {engine.turn_count}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,12 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING, List, Optional, Tuple
-import random
 
-import numpy as np
 import tcod
 
 from actions import Action, BumpAction, MeleeAction, MovementAction, WaitAction
+from metrics import metrics
+import turn_scheduler
 
 if TYPE_CHECKING:
     from entity import Actor
@@ -16,41 +16,58 @@ class BaseAI(Action):
     def perform(self) -> None:
         raise NotImplementedError()
 
+    def catch_up(self, elapsed_time: int) -> None:
+        """Called when this AI wakes up after being dormant for `elapsed_time` time units.
+
+        AI with timed effects should advance them here.
+        """
+
+    def hear_noise(self, x: int, y: int) -> None:
+        """Called when this AI is woken by a noise at this location."""
+
     def get_path_to(self, dest_x: int, dest_y: int) -> List[Tuple[int, int]]:
         """Compute and return a path to the target position.
 
         If there is no valid path then returns an empty list.
         """
-        # Copy the walkable array.
-        cost = np.array(self.entity.gamemap.tiles["walkable"], dtype=np.int8)
+        with metrics.time("path.get_path_to"):
+            cost = self.entity.gamemap.get_path_cost()
 
-        for entity in self.entity.gamemap.entities:
-            # Check that an enitiy blocks movement and the cost isn't zero (blocking.)
-            if entity.blocks_movement and cost[entity.x, entity.y]:
-                # Add to the cost of a blocked position.
-                # A lower number means more enemies will crowd behind each other in
-                # hallways.  A higher number means enemies will take longer paths in
-                # order to surround the player.
-                cost[entity.x, entity.y] += 10
+            # Create a graph from the cost array and pass that graph to a new pathfinder.
+            graph = tcod.path.SimpleGraph(cost=cost, cardinal=2, diagonal=3)
+            pathfinder = tcod.path.Pathfinder(graph)
 
-        # Create a graph from the cost array and pass that graph to a new pathfinder.
-        graph = tcod.path.SimpleGraph(cost=cost, cardinal=2, diagonal=3)
-        pathfinder = tcod.path.Pathfinder(graph)
+            pathfinder.add_root((self.entity.x, self.entity.y))  # Start position.
 
-        pathfinder.add_root((self.entity.x, self.entity.y))  # Start position.
-
-        # Compute the path to the destination and remove the starting point.
-        path: List[List[int]] = pathfinder.path_to((dest_x, dest_y))[1:].tolist()
+            # Compute the path to the destination and remove the starting point.
+            path: List[List[int]] = pathfinder.path_to((dest_x, dest_y))[1:].tolist()
 
         # Convert from List[List[int]] to List[Tuple[int, int]].
         return [(index[0], index[1]) for index in path]
 
+    def get_path_to_player(self) -> List[Tuple[int, int]]:
+        """Return a path to the player by walking down the flow field shared by every monster.
+
+        If there is no valid path then returns an empty list.
+        """
+        pathfinder = self.engine.get_player_flow_field()
+
+        # Walk from this entity to the player and remove the starting point.
+        path: List[List[int]] = pathfinder.path_from((self.entity.x, self.entity.y))[1:].tolist()
+
+        return [(index[0], index[1]) for index in path]
+
 
 class HostileEnemy(BaseAI):
     def __init__(self, entity: Actor):
         super().__init__(entity)
         self.path: List[Tuple[int, int]] = []
 
+    def hear_noise(self, x: int, y: int) -> None:
+        """Go and look where the noise came from, unless already going somewhere."""
+        if not self.path:
+            self.path = self.get_path_to(x, y)
+
     def perform(self) -> None:
         target = self.engine.player
         dx = target.x - self.entity.x
@@ -61,7 +78,10 @@ def perform(self) -> None:
             if distance <= 1:
                 return MeleeAction(self.entity, dx, dy).perform()
 
-            self.path = self.get_path_to(target.x, target.y)
+            if self.engine.flow_field_pathing:
+                self.path = self.get_path_to_player()
+            else:
+                self.path = self.get_path_to(target.x, target.y)
 
         if self.path:
             dest_x, dest_y = self.path.pop(0)
@@ -86,6 +106,11 @@ def __init__(self, entity: Actor, previous_ai: Optional[BaseAI], turns_remaining
         self.previous_ai = previous_ai
         self.turns_remaining = turns_remaining
 
+    def catch_up(self, elapsed_time: int) -> None:
+        """The confusion wears off while dormant, the message for it is shown on the next turn."""
+        turns_missed = elapsed_time // turn_scheduler.action_delay(self.entity.speed)
+        self.turns_remaining = max(0, self.turns_remaining - turns_missed)
+
     def perform(self) -> None:
         # Revert the AI back to the original state if the effect has run its course.
         if self.turns_remaining <= 0:
@@ -93,7 +118,7 @@ def perform(self) -> None:
             self.entity.ai = self.previous_ai
         else:
             # Pick a random direction
-            direction_x, direction_y = random.choice(
+            direction_x, direction_y = self.entity.gamemap.rng.choice(
                 [
                     (-1, -1),  # Northwest
                     (0, -1),  # North
@@ -13,8 +13,12 @@
 if TYPE_CHECKING:
     from entity import Actor, Item
 
+FIREBALL_NOISE_RADIUS = 20  # Dormant actors this close to an explosion are woken by it.
+
 
 class Consumable(BaseComponent):
+    __slots__ = ()
+
     parent: Item
 
     def get_action(self, consumer: Actor) -> Optional[ActionOrHandler]:
@@ -37,6 +41,8 @@ def consume(self) -> None:
 
 
 class ConfusionConsumable(Consumable):
+    __slots__ = ("number_of_turns",)
+
     def __init__(self, number_of_turns: int):
         self.number_of_turns = number_of_turns
 
@@ -71,6 +77,8 @@ def activate(self, action: actions.ItemAction) -> None:
 
 
 class FireballDamageConsumable(Consumable):
+    __slots__ = ("damage", "radius")
+
     def __init__(self, damage: int, radius: int):
         self.damage = damage
         self.radius = radius
@@ -100,10 +108,13 @@ def activate(self, action: actions.ItemAction) -> None:
 
         if not targets_hit:
             raise Impossible("There are no targets in the radius.")
+        self.engine.game_map.wake_actors_near(*target_xy, FIREBALL_NOISE_RADIUS)
         self.consume()
 
 
 class HealingConsumable(Consumable):
+    __slots__ = ("amount",)
+
     def __init__(self, amount: int):
         self.amount = amount
 
@@ -122,6 +133,8 @@ def activate(self, action: actions.ItemAction) -> None:
 
 
 class LightningDamageConsumable(Consumable):
+    __slots__ = ("damage", "maximum_range")
+
     def __init__(self, damage: int, maximum_range: int):
         self.damage = damage
         self.maximum_range = maximum_range
@@ -11,6 +11,8 @@
 
 
 class Fighter(BaseComponent):
+    __slots__ = ("max_hp", "_hp", "base_defense", "base_power")
+
     parent: Actor
 
     def __init__(self, hp: int, base_defense: int, base_power: int):
@@ -65,6 +67,7 @@ def die(self) -> None:
         self.parent.ai = None
         self.parent.name = f"remains of {self.parent.name}"
         self.parent.render_order = RenderOrder.CORPSE
+        self.gamemap.on_actor_death(self.parent)
 
         self.engine.message_log.add_message(death_message, death_message_color)
 
@@ -9,6 +9,8 @@
 
 
 class Level(BaseComponent):
+    __slots__ = ("current_level", "current_xp", "level_up_base", "level_up_factor", "xp_given")
+
     parent: Actor
 
     def __init__(
@@ -49,6 +51,10 @@ def increase_level(self) -> None:
 
         self.current_level += 1
 
+    def increase_stat(self, choice: int) -> None:
+        """Increase the stat picked when leveling up, 0 is max HP, 1 is power and 2 is defense."""
+        (self.increase_max_hp, self.increase_power, self.increase_defense)[choice]()
+
     def increase_max_hp(self, amount: int = 20) -> None:
         self.parent.fighter.max_hp += amount
         self.parent.fighter.hp += amount
@@ -1,19 +1,23 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
-import lzma
-import pickle
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
 from tcod.console import Console
 from tcod.map import compute_fov
+import tcod
 
 from message_log import MessageLog
+from metrics import metrics
 import exceptions
 import render_functions
+import save_format
+import tile_types
+import turn_scheduler
 
 if TYPE_CHECKING:
     from entity import Actor
     from game_map import GameMap, GameWorld
+    from journal import Journal
 
 
 class Engine:
@@ -24,24 +28,118 @@ def __init__(self, player: Actor):
         self.message_log = MessageLog()
         self.mouse_location = (0, 0)
         self.player = player
+        self.turn_count = 0  # The number of turns the player has taken.
+        self.command_count = 0  # The number of commands the player has given, including ones which were impossible.
+        self.journal: Optional[Journal] = None  # Where commands are recorded, this is not saved with the game.
+        self.save_filename: Optional[str] = None  # The save slot of this game, this is not saved with the game.
+        # If True then hostile monsters share one distance map rooted at the player instead of pathing individually.
+        self.flow_field_pathing = False
+        self.fov_radius = 8  # A radius of 0 means unlimited, which computes over the whole map.
+        self.fov_algorithm = tcod.FOV_RESTRICTIVE
+        # Monsters further than this from the player, or out of explored areas, go dormant until the player is near.
+        # This should be at least as large as the FOV radius.
+        self.activity_radius = 20
+        self._player_flow_field: Optional[tcod.path.Pathfinder] = None  # Only valid during handle_enemy_turns.
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Leave out the journal and save slot, they belong to the running game and not to the saved one."""
+        state = self.__dict__.copy()
+        state["journal"] = None
+        state["save_filename"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore from a pickle, filling in attributes which saves from older versions don't have."""
+        legacy = "fov_radius" not in state  # A save from before the map kept indexes of its entities.
+        state.setdefault("turn_count", 0)
+        state.setdefault("command_count", 0)
+        state.setdefault("journal", None)
+        state.setdefault("save_filename", None)
+        state.setdefault("flow_field_pathing", False)
+        state.setdefault("fov_radius", 8)
+        state.setdefault("fov_algorithm", tcod.FOV_RESTRICTIVE)
+        state.setdefault("activity_radius", 20)
+        state.setdefault("_player_flow_field", None)
+        self.__dict__.update(state)
+        if legacy:
+            # Every object in the save has been restored by now, which isn't the case yet when the map is restored.
+            self.game_map.index_legacy_entities()
+
+    def record_command(self, command: Dict[str, Any]) -> None:
+        """Count a command the player has just given, and append it to the journal if there is one."""
+        if self.journal is not None:
+            self.journal.append(self, command)
+        self.command_count += 1
 
     def handle_enemy_turns(self) -> None:
-        for entity in set(self.game_map.actors) - {self.player}:
-            if entity.ai:
-                try:
-                    entity.ai.perform()
-                except exceptions.Impossible:
-                    pass  # Ignore impossible action exceptions from AI.
+        """Let every actor act whose turn comes up before the players next turn."""
+        scheduler = self.game_map.scheduler
+        end_time = scheduler.time + turn_scheduler.action_delay(self.player.speed)
+        self.game_map.wake_active_actors()
+        try:
+            while True:
+                entity = scheduler.pop_before(end_time)
+                if entity is None:
+                    break
+                if not self.game_map.is_active(entity):
+                    self.game_map.make_dormant(entity)
+                    continue
+                scheduler.schedule(entity, turn_scheduler.action_delay(entity.speed))
+                if entity.ai:
+                    try:
+                        entity.ai.perform()
+                    except exceptions.Impossible:
+                        pass  # Ignore impossible action exceptions from AI.
+            scheduler.time = end_time
+        finally:
+            self._player_flow_field = None  # Pathfinders can not be pickled, and this one is now outdated.
+
+    def get_player_flow_field(self) -> tcod.path.Pathfinder:
+        """Return a pathfinder rooted at the player which has been resolved over the whole map.
+
+        This is computed at most once per enemy turn and is shared by every monster.
+        """
+        if self._player_flow_field is None:
+            with metrics.time("path.flow_field_builds"):
+                graph = tcod.path.SimpleGraph(cost=self.game_map.get_path_cost(), cardinal=2, diagonal=3)
+                self._player_flow_field = tcod.path.Pathfinder(graph)
+                self._player_flow_field.add_root((self.player.x, self.player.y))
+                self._player_flow_field.resolve()
+        return self._player_flow_field
 
     def update_fov(self) -> None:
-        """Recompute the visible area based on the players point of view."""
-        self.game_map.visible[:] = compute_fov(
-            self.game_map.tiles["transparent"],
-            (self.player.x, self.player.y),
-            radius=8,
-        )
-        # If a tile is "visible" it should be added to "explored".
-        self.game_map.explored |= self.game_map.visible
+        """Recompute the visible area based on the players point of view.
+
+        Only the area within the FOV radius of the player is computed, and only the previously visible area is cleared.
+        Nothing is done if the player position, the FOV settings and the map tiles are the same as the last time.
+        """
+        game_map = self.game_map
+        fov_key = (self.player.x, self.player.y, self.fov_radius, self.fov_algorithm, game_map.tiles_version)
+        if fov_key == game_map.fov_key:
+            metrics.count("fov.skipped")
+            return
+        with metrics.time("fov.computed"):
+            if self.fov_radius > 0:
+                left, top = max(0, self.player.x - self.fov_radius), max(0, self.player.y - self.fov_radius)
+                right = min(game_map.width, self.player.x + self.fov_radius + 1)
+                bottom = min(game_map.height, self.player.y + self.fov_radius + 1)
+            else:
+                left, top, right, bottom = 0, 0, game_map.width, game_map.height
+            window = slice(left, right), slice(top, bottom)
+
+            game_map.visible[game_map.fov_window] = False
+            game_map.mark_dirty(game_map.fov_window)
+            game_map.visible[window] = compute_fov(
+                tile_types.TILES["transparent"][game_map.tiles[window]],
+                (self.player.x - left, self.player.y - top),
+                radius=self.fov_radius,
+                algorithm=self.fov_algorithm,
+            )
+            # If a tile is "visible" it should be added to "explored".
+            game_map.explored[window] |= game_map.visible[window]
+            game_map.mark_dirty(window)
+        game_map.fov_key = fov_key
+        game_map.fov_window = window
 
     def render(self, console: Console) -> None:
         self.game_map.render(console)
@@ -63,8 +161,6 @@ def render(self, console: Console) -> None:
 
         render_functions.render_names_at_mouse_location(console=console, x=21, y=44, engine=self)
 
-    def save_as(self, filename: str) -> None:
-        """Save this Engine instance as a compressed file."""
-        save_data = lzma.compress(pickle.dumps(self))
-        with open(filename, "wb") as f:
-            f.write(save_data)
+    def save_as(self, filename: str, codec: str = save_format.DEFAULT_CODEC) -> None:
+        """Save this Engine instance to a file, compressed with a codec from save_format.CODECS."""
+        save_format.save_engine(self, filename, codec)
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Optional, Tuple, Type, TypeVar, Union
-import copy
+from typing import TYPE_CHECKING, Any, Optional, Tuple, Type, Union
 import math
 
 from render_order import RenderOrder
+from slotted import Slotted
 
 if TYPE_CHECKING:
     from components.ai import BaseAI
@@ -16,14 +16,14 @@
     from components.level import Level
     from game_map import GameMap
 
-T = TypeVar("T", bound="Entity")
 
-
-class Entity:
+class Entity(Slotted):
     """
     A generic object to represent players, enemies, items, etc.
     """
 
+    __slots__ = ("parent", "x", "y", "char", "color", "name", "blocks_movement", "render_order")
+
     parent: Union[GameMap, Inventory]
 
     def __init__(
@@ -47,21 +47,12 @@ def __init__(
         if parent:
             # If parent isn't provided now then it will be set later.
             self.parent = parent
-            parent.entities.add(self)
+            parent.add_entity(self)
 
     @property
     def gamemap(self) -> GameMap:
         return self.parent.gamemap
 
-    def spawn(self: T, gamemap: GameMap, x: int, y: int) -> T:
-        """Spawn a copy of this instance at the given location."""
-        clone = copy.deepcopy(self)
-        clone.x = x
-        clone.y = y
-        clone.parent = gamemap
-        gamemap.entities.add(clone)
-        return clone
-
     def place(self, x: int, y: int, gamemap: Optional[GameMap] = None) -> None:
         """Place this entitiy at a new location.  Handles moving across GameMaps."""
         self.x = x
@@ -69,9 +60,11 @@ def place(self, x: int, y: int, gamemap: Optional[GameMap] = None) -> None:
         if gamemap:
             if hasattr(self, "parent"):  # Possibly uninitialized.
                 if self.parent is self.gamemap:
-                    self.gamemap.entities.remove(self)
+                    self.gamemap.remove_entity(self)
             self.parent = gamemap
-            gamemap.entities.add(self)
+            gamemap.add_entity(self)
+        elif hasattr(self, "parent") and self.parent is self.gamemap:
+            self.gamemap.update_entity_location(self)
 
     def distance(self, x: int, y: int) -> float:
         """
@@ -83,9 +76,12 @@ def move(self, dx: int, dy: int) -> None:
         # Move the entity by a given amount
         self.x += dx
         self.y += dy
+        self.gamemap.update_entity_location(self)
 
 
 class Actor(Entity):
+    __slots__ = ("ai", "speed", "equipment", "fighter", "inventory", "level")
+
     def __init__(
         self,
         *,
@@ -99,6 +95,7 @@ def __init__(
         fighter: Fighter,
         inventory: Inventory,
         level: Level,
+        speed: int = 100,
     ):
         super().__init__(
             x=x,
@@ -112,6 +109,8 @@ def __init__(
 
         self.ai: Optional[BaseAI] = ai_cls(self)
 
+        self.speed = speed  # Energy gained per 100 time units, one action costs 100 energy.
+
         self.equipment: Equipment = equipment
         self.equipment.parent = self
 
@@ -124,6 +123,10 @@ def __init__(
         self.level = level
         self.level.parent = self
 
+    def __setstate__(self, state: Any) -> None:
+        self.speed = 100  # Actors saved by older versions have no speed.
+        super().__setstate__(state)
+
     @property
     def is_alive(self) -> bool:
         """Returns True as long as this actor can perform actions."""
@@ -131,6 +134,8 @@ def is_alive(self) -> bool:
 
 
 class Item(Entity):
+    __slots__ = ("consumable", "equippable")
+
     def __init__(
         self,
         *,
@@ -1,77 +1,76 @@
+from functools import partial
+
 from components import consumable, equippable
 from components.ai import HostileEnemy
-from components.equipment import Equipment
-from components.fighter import Fighter
-from components.inventory import Inventory
-from components.level import Level
-from entity import Actor, Item
+from entity_templates import ActorTemplate, ItemTemplate
 
-player = Actor(
+player = ActorTemplate(
     char="@",
     color=(255, 255, 255),
     name="Player",
     ai_cls=HostileEnemy,
-    equipment=Equipment(),
-    fighter=Fighter(hp=30, base_defense=1, base_power=2),
-    inventory=Inventory(capacity=26),
-    level=Level(level_up_base=200),
+    hp=30,
+    base_defense=1,
+    base_power=2,
+    inventory_capacity=26,
+    level_up_base=200,
 )
 
-orc = Actor(
+orc = ActorTemplate(
     char="o",
     color=(63, 127, 63),
     name="Orc",
     ai_cls=HostileEnemy,
-    equipment=Equipment(),
-    fighter=Fighter(hp=10, base_defense=0, base_power=3),
-    inventory=Inventory(capacity=0),
-    level=Level(xp_given=35),
+    hp=10,
+    base_defense=0,
+    base_power=3,
+    xp_given=35,
 )
-troll = Actor(
+troll = ActorTemplate(
     char="T",
     color=(0, 127, 0),
     name="Troll",
     ai_cls=HostileEnemy,
-    equipment=Equipment(),
-    fighter=Fighter(hp=16, base_defense=1, base_power=4),
-    inventory=Inventory(capacity=0),
-    level=Level(xp_given=100),
+    hp=16,
+    base_defense=1,
+    base_power=4,
+    xp_given=100,
 )
 
-confusion_scroll = Item(
+confusion_scroll = ItemTemplate(
     char="~",
     color=(207, 63, 255),
     name="Confusion Scroll",
-    consumable=consumable.ConfusionConsumable(number_of_turns=10),
+    consumable=partial(consumable.ConfusionConsumable, number_of_turns=10),
 )
-fireball_scroll = Item(
+fireball_scroll = ItemTemplate(
     char="~",
     color=(255, 0, 0),
     name="Fireball Scroll",
-    consumable=consumable.FireballDamageConsumable(damage=12, radius=3),
+    consumable=partial(consumable.FireballDamageConsumable, damage=12, radius=3),
 )
-health_potion = Item(
+health_potion = ItemTemplate(
     char="!",
     color=(127, 0, 255),
     name="Health Potion",
-    consumable=consumable.HealingConsumable(amount=4),
+    consumable=partial(consumable.HealingConsumable, amount=4),
 )
-lightning_scroll = Item(
+lightning_scroll = ItemTemplate(
     char="~",
     color=(255, 255, 0),
     name="Lightning Scroll",
-    consumable=consumable.LightningDamageConsumable(damage=20, maximum_range=5),
+    consumable=partial(consumable.LightningDamageConsumable, damage=20, maximum_range=5),
 )
 
-dagger = Item(char="/", color=(0, 191, 255), name="Dagger", equippable=equippable.Dagger())
+dagger = ItemTemplate(char="/", color=(0, 191, 255), name="Dagger", equippable=equippable.Dagger)
 
-sword = Item(char="/", color=(0, 191, 255), name="Sword", equippable=equippable.Sword())
+sword = ItemTemplate(char="/", color=(0, 191, 255), name="Sword", equippable=equippable.Sword)
 
-leather_armor = Item(
+leather_armor = ItemTemplate(
     char="[",
     color=(139, 69, 19),
     name="Leather Armor",
-    equippable=equippable.LeatherArmor(),
+    equippable=equippable.LeatherArmor,
 )
 
-chain_mail = Item(char="[", color=(139, 69, 19), name="Chain Mail", equippable=equippable.ChainMail())
+chain_mail = ItemTemplate(char="[", color=(139, 69, 19), name="Chain Mail", equippable=equippable.ChainMail)
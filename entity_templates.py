@@ -0,0 +1,104 @@
+"""Templates which build new entities directly from their constructors.
+
+A template holds only the parts of an entity which never change, these are shared by every entity built from it.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Optional, Tuple, Type, Union
+
+from components.equipment import Equipment
+from components.fighter import Fighter
+from components.inventory import Inventory
+from components.level import Level
+from entity import Actor, Item
+
+if TYPE_CHECKING:
+    from components.ai import BaseAI
+    from components.consumable import Consumable
+    from components.equippable import Equippable
+    from game_map import GameMap
+
+
+class ActorTemplate:
+    def __init__(
+        self,
+        *,
+        char: str,
+        color: Tuple[int, int, int],
+        name: str,
+        ai_cls: Type[BaseAI],
+        hp: int,
+        base_defense: int,
+        base_power: int,
+        inventory_capacity: int = 0,
+        level_up_base: int = 0,
+        xp_given: int = 0,
+        speed: int = 100,
+    ):
+        self.char = char
+        self.color = color
+        self.name = name
+        self.ai_cls = ai_cls
+        self.hp = hp
+        self.base_defense = base_defense
+        self.base_power = base_power
+        self.inventory_capacity = inventory_capacity
+        self.level_up_base = level_up_base
+        self.xp_given = xp_given
+        self.speed = speed
+
+    def build(self) -> Actor:
+        """Return a new actor made from this template, it is not placed on any map."""
+        return Actor(
+            char=self.char,
+            color=self.color,
+            name=self.name,
+            ai_cls=self.ai_cls,
+            equipment=Equipment(),
+            fighter=Fighter(hp=self.hp, base_defense=self.base_defense, base_power=self.base_power),
+            inventory=Inventory(capacity=self.inventory_capacity),
+            level=Level(level_up_base=self.level_up_base, xp_given=self.xp_given),
+            speed=self.speed,
+        )
+
+    def spawn(self, gamemap: GameMap, x: int, y: int) -> Actor:
+        """Build a new actor from this template at the given location."""
+        actor = self.build()
+        actor.place(x, y, gamemap)
+        return actor
+
+
+class ItemTemplate:
+    def __init__(
+        self,
+        *,
+        char: str,
+        color: Tuple[int, int, int],
+        name: str,
+        consumable: Optional[Callable[[], Consumable]] = None,
+        equippable: Optional[Callable[[], Equippable]] = None,
+    ):
+        self.char = char
+        self.color = color
+        self.name = name
+        self.consumable = consumable  # Builds a new consumable component, such as a class or a functools.partial.
+        self.equippable = equippable  # Builds a new equippable component.
+
+    def build(self) -> Item:
+        """Return a new item made from this template, it is not placed on any map."""
+        return Item(
+            char=self.char,
+            color=self.color,
+            name=self.name,
+            consumable=self.consumable() if self.consumable else None,
+            equippable=self.equippable() if self.equippable else None,
+        )
+
+    def spawn(self, gamemap: GameMap, x: int, y: int) -> Item:
+        """Build a new item from this template at the given location."""
+        item = self.build()
+        item.place(x, y, gamemap)
+        return item
+
+
+EntityTemplate = Union[ActorTemplate, ItemTemplate]
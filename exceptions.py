@@ -5,5 +5,9 @@ class Impossible(Exception):
     """
 
 
+class SaveFormatError(Exception):
+    """Exception raised when a save file can not be read by this version of the game."""
+
+
 class QuitWithoutSaving(SystemExit):
     """Can be raised to exit the game without automatically saving."""
@@ -1,58 +1,410 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Iterable, Iterator, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+import concurrent.futures
+import random
+import time
 
 from tcod.console import Console
 import numpy as np
 
 from entity import Actor, Item
+from metrics import metrics
+from turn_scheduler import TurnScheduler
 import tile_types
 
 if TYPE_CHECKING:
     from engine import Engine
     from entity import Entity
+    from procgen import DungeonPlan
+
+DORMANT_CHUNK_SIZE = 16  # Dormant actors are grouped into square chunks of this size.
+NOISE_ALERT_TIME = 1000  # Actors woken by a noise stay active for this long, even when far from the player.
 
 
 class GameMap:
-    def __init__(self, engine: Engine, width: int, height: int, entities: Iterable[Entity] = ()):
+    # Attributes derived from the entities on this map, these are rebuilt by index_entities.
+    ENTITY_INDEXES = (
+        "entities",
+        "_entity_locations",
+        "_entities_by_location",
+        "_live_actors",
+        "_dead_actors",
+        "_items",
+        "_blocking_entities",
+        "blocked",
+    )
+
+    def __init__(
+        self,
+        engine: Engine,
+        width: int,
+        height: int,
+        entities: Iterable[Entity] = (),
+        rng: Optional[random.Random] = None,
+    ):
         self.engine = engine
+        self.rng = rng if rng is not None else random.Random()  # Random numbers for the AI on this map.
         self.width, self.height = width, height
-        self.entities = set(entities)
-        self.tiles = np.full((width, height), fill_value=tile_types.wall, order="F")
+        self.entities: Set[Entity] = set()
+        self._entity_locations: Dict[Entity, Tuple[int, int]] = {}  # The location each entity is indexed under.
+        self._entities_by_location: Dict[Tuple[int, int], List[Entity]] = {}  # Spatial index of entities.
+        self._live_actors: Dict[Actor, None] = {}  # A dict instead of a set so that the order is deterministic.
+        self._dead_actors: Set[Actor] = set()
+        self._items: Set[Item] = set()
+        self._blocking_entities: Set[Entity] = set()  # Entities which are counted in `blocked`.
+        # The tile ID of every position, the properties of each ID are in tile_types.TILES.
+        self.tiles = np.full((width, height), fill_value=tile_types.wall, dtype=tile_types.tile_id_dt, order="F")
+        # The number of movement blocking entities on each tile.
+        self.blocked = np.zeros((width, height), dtype=np.uint8, order="F")
+        self._path_cost: Optional[np.ndarray] = None  # Cached by get_path_cost.
+        self.scheduler = TurnScheduler()  # Turn order of the living actors other than the player.
+        self._dormant_since: Dict[Actor, int] = {}  # Actors which are not scheduled, and the time they went dormant.
+        self._dormant_by_chunk: Dict[Tuple[int, int], List[Actor]] = {}
+        self._alert_until: Dict[Actor, int] = {}  # Actors woken by a noise, and the time they stay active until.
+        for entity in entities:
+            self.add_entity(entity)
 
         self.visible = np.full((width, height), fill_value=False, order="F")  # Tiles the player can currently see
         self.explored = np.full((width, height), fill_value=False, order="F")  # Tiles the player has seen before
 
         self.downstairs_location = (0, 0)
 
+        self.tiles_version = 0  # Increased by on_tiles_changed, so that data derived from the tiles can be cached.
+        self.fov_key: Optional[Tuple[int, int, int, int, int]] = None  # The inputs of the last FOV computation.
+        self.fov_window: Tuple[slice, slice] = (slice(0, 0), slice(0, 0))  # The area which `visible` may be set in.
+
+        # Render caches, these are not pickled.
+        self._map_layer: Optional[np.ndarray] = None  # The tile graphics last drawn by render.
+        self._map_layer_version = -1  # The tiles_version of _map_layer.
+        self._dirty_windows: List[Tuple[slice, slice]] = []  # Areas of _map_layer which need to be redrawn.
+        self._entity_layer: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = None  # x, y, ch, fg
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Leave out the caches which are rebuilt on demand."""
+        state = self.__dict__.copy()
+        state["_path_cost"] = None
+        state["_map_layer"] = None
+        state["_dirty_windows"] = []
+        state["_entity_layer"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore from a pickle, converting maps saved before tile IDs and the entity indexes.
+
+        The entities of such a map are indexed later by index_legacy_entities, since pickle can restore the map before
+        the entities it holds.
+        """
+        if "scheduler" in state:
+            state.setdefault("_alert_until", {})
+            self.__dict__.update(state)
+            return
+        width, height = state["width"], state["height"]
+        tiles = np.full((width, height), fill_value=tile_types.wall, dtype=tile_types.tile_id_dt, order="F")
+        for tile_id, tile in enumerate(tile_types.TILES):
+            tiles[state["tiles"] == tile] = tile_id
+        state["tiles"] = tiles
+        state.update(
+            rng=random.Random(),
+            _entity_locations={},
+            _entities_by_location={},
+            _live_actors={},
+            _dead_actors=set(),
+            _items=set(),
+            _blocking_entities=set(),
+            blocked=np.zeros((width, height), dtype=np.uint8, order="F"),
+            _path_cost=None,
+            scheduler=TurnScheduler(),
+            _dormant_since={},
+            _dormant_by_chunk={},
+            _alert_until={},
+            tiles_version=0,
+            fov_key=None,
+            fov_window=(slice(0, width), slice(0, height)),  # Older versions could leave any tile visible.
+            _map_layer=None,
+            _map_layer_version=-1,
+            _dirty_windows=[],
+            _entity_layer=None,
+        )
+        self.__dict__.update(state)
+
+    def index_legacy_entities(self) -> None:
+        """Index the entities of a map restored from a save from before the entity indexes, and schedule its actors."""
+        self.index_entities(sorted(self.entities, key=lambda entity: (entity.x, entity.y)))
+        for actor in self.actors:
+            if actor is not self.engine.player:
+                self.scheduler.schedule(actor)
+
     @property
     def gamemap(self) -> GameMap:
         return self
 
+    @property
+    def walkable(self) -> np.ndarray:
+        """Return a new boolean array of the walkable tiles on this map."""
+        return tile_types.TILES["walkable"][self.tiles]
+
+    @property
+    def transparent(self) -> np.ndarray:
+        """Return a new boolean array of the tiles on this map which don't block FOV."""
+        return tile_types.TILES["transparent"][self.tiles]
+
     @property
     def actors(self) -> Iterator[Actor]:
-        """Iterate over this maps living actors."""
-        yield from (entity for entity in self.entities if isinstance(entity, Actor) and entity.is_alive)
+        """Iterate over this maps living actors, in the order they were added.
+
+        The order does not depend on the order of a set, so that replaying the same commands has the same outcome.
+        Actors which die during iteration are skipped.
+        """
+        yield from (actor for actor in tuple(self._live_actors) if actor.is_alive)
+
+    @property
+    def dead_actors(self) -> Iterator[Actor]:
+        """Iterate over the remains of this maps actors."""
+        yield from self._dead_actors
 
     @property
     def items(self) -> Iterator[Item]:
-        yield from (entity for entity in self.entities if isinstance(entity, Item))
+        yield from self._items
+
+    def add_entity(self, entity: Entity) -> None:
+        """Add an entity to this map, or update its indexed location if it is already on this map."""
+        if entity in self._entity_locations:
+            self.update_entity_location(entity)
+            return
+        self._entity_layer = None
+        self._index_entity(entity)
+        if isinstance(entity, Actor) and entity.is_alive and entity is not self.engine.player:
+            self.scheduler.schedule(entity)
+
+    def _index_entity(self, entity: Entity) -> None:
+        location = entity.x, entity.y
+        self.entities.add(entity)
+        self._entity_locations[entity] = location
+        self._entities_by_location.setdefault(location, []).append(entity)
+        if isinstance(entity, Actor):
+            if entity.is_alive:
+                self._live_actors[entity] = None
+            else:
+                self._dead_actors.add(entity)
+        elif isinstance(entity, Item):
+            self._items.add(entity)
+        self._update_blocking(entity)
+
+    def entities_in_index_order(self) -> List[Entity]:
+        """Return every entity on this map in an order which index_entities restores exactly.
+
+        Entities on the same tile are in the order they were added, and the living actors are in the order of `actors`.
+        """
+        locations = dict.fromkeys(self._entity_locations[actor] for actor in self._live_actors)
+        locations.update(dict.fromkeys(self._entities_by_location))
+        return [entity for location in locations for entity in self._entities_by_location[location]]
+
+    def index_entities(self, entities: Iterable[Entity]) -> None:
+        """Rebuild the ENTITY_INDEXES of this map from `entities`, which become the entities on this map.
+
+        Unlike add_entity this does not schedule any actors, it is used when the scheduler is restored separately.
+        """
+        self.entities = set()
+        self._entity_locations = {}
+        self._entities_by_location = {}
+        self._live_actors = {}
+        self._dead_actors = set()
+        self._items = set()
+        self._blocking_entities = set()
+        self.blocked = np.zeros((self.width, self.height), dtype=np.uint8, order="F")
+        self._path_cost = None
+        self._entity_layer = None
+        for entity in entities:
+            self._index_entity(entity)
+
+    def remove_entity(self, entity: Entity) -> None:
+        """Remove an entity from this map."""
+        self._entity_layer = None
+        if entity in self._blocking_entities:
+            self._blocking_entities.remove(entity)
+            self._change_blocked(self._entity_locations[entity], -1)
+        if isinstance(entity, Actor) and entity in self._dormant_since:
+            self._forget_dormant_actor(entity)
+        self.entities.remove(entity)
+        self._unindex_entity(entity, self._entity_locations.pop(entity))
+        if isinstance(entity, Actor):
+            self._live_actors.pop(entity, None)
+            self._dead_actors.discard(entity)
+            self._alert_until.pop(entity, None)
+            self.scheduler.unschedule(entity)
+        elif isinstance(entity, Item):
+            self._items.discard(entity)
+
+    def on_actor_death(self, actor: Actor) -> None:
+        """Move an actor which has just died from the living actors to the dead ones."""
+        self._entity_layer = None  # The actor is now drawn as a corpse.
+        if actor in self._live_actors:
+            del self._live_actors[actor]
+            self._dead_actors.add(actor)
+            self.scheduler.unschedule(actor)
+        if actor in self._dormant_since:
+            self._forget_dormant_actor(actor)
+        self._alert_until.pop(actor, None)
+        self._update_blocking(actor)
+
+    def is_active(self, actor: Actor) -> bool:
+        """Return True if this actor is close enough to the player to be worth simulating.
+
+        Actors are active when they can be seen, when they are on explored tiles within the engines
+        `activity_radius` of the player, or for NOISE_ALERT_TIME after they were woken by a noise.
+        """
+        if self.visible[actor.x, actor.y]:
+            return True
+        if self._alert_until and self._alert_until.get(actor, -1) >= self.scheduler.time:
+            return True
+        player = self.engine.player
+        distance = max(abs(actor.x - player.x), abs(actor.y - player.y))  # Chebyshev distance.
+        return distance <= self.engine.activity_radius and bool(self.explored[actor.x, actor.y])
+
+    def make_dormant(self, actor: Actor) -> None:
+        """Stop scheduling turns for this actor until it is woken up."""
+        self.scheduler.unschedule(actor)
+        self._dormant_since[actor] = self.scheduler.time
+        self._add_to_dormant_chunk(actor, self._entity_locations[actor])
+
+    def wake_active_actors(self) -> None:
+        """Wake the dormant actors which have become active.
+
+        Only the chunks within the activity radius of the player are checked.
+        """
+        player = self.engine.player
+        for actor in self._dormant_actors_near(player.x, player.y, self.engine.activity_radius):
+            if self.is_active(actor):
+                self._wake_actor(actor)
+
+    def wake_actors_near(self, x: int, y: int, radius: int) -> None:
+        """Wake every dormant actor within `radius` tiles of a noise at this location.
+
+        The woken actors stay active for NOISE_ALERT_TIME and are told where the noise came from.
+        """
+        for actor in self._dormant_actors_near(x, y, radius):
+            if max(abs(actor.x - x), abs(actor.y - y)) <= radius:
+                self._wake_actor(actor)
+                self._alert_until[actor] = self.scheduler.time + NOISE_ALERT_TIME
+                if actor.ai:
+                    actor.ai.hear_noise(x, y)
+
+    def _dormant_actors_near(self, x: int, y: int, radius: int) -> List[Actor]:
+        """Return the dormant actors in every chunk which overlaps the given area."""
+        actors: List[Actor] = []
+        for chunk_x in range((x - radius) // DORMANT_CHUNK_SIZE, (x + radius) // DORMANT_CHUNK_SIZE + 1):
+            for chunk_y in range((y - radius) // DORMANT_CHUNK_SIZE, (y + radius) // DORMANT_CHUNK_SIZE + 1):
+                actors += self._dormant_by_chunk.get((chunk_x, chunk_y), ())
+        return actors
+
+    def _wake_actor(self, actor: Actor) -> None:
+        """Catch up on the time this actor spent dormant, then schedule its next turn."""
+        time_dormant = self.scheduler.time - self._dormant_since[actor]
+        self._forget_dormant_actor(actor)
+        if actor.ai:
+            actor.ai.catch_up(time_dormant)
+        self.scheduler.schedule(actor)
+
+    def _forget_dormant_actor(self, actor: Actor) -> None:
+        del self._dormant_since[actor]
+        self._remove_from_dormant_chunk(actor, self._entity_locations[actor])
+
+    def _add_to_dormant_chunk(self, actor: Actor, location: Tuple[int, int]) -> None:
+        chunk = location[0] // DORMANT_CHUNK_SIZE, location[1] // DORMANT_CHUNK_SIZE
+        self._dormant_by_chunk.setdefault(chunk, []).append(actor)
+
+    def _remove_from_dormant_chunk(self, actor: Actor, location: Tuple[int, int]) -> None:
+        chunk = location[0] // DORMANT_CHUNK_SIZE, location[1] // DORMANT_CHUNK_SIZE
+        actors_here = self._dormant_by_chunk[chunk]
+        actors_here.remove(actor)
+        if not actors_here:
+            del self._dormant_by_chunk[chunk]
+
+    def _update_blocking(self, entity: Entity) -> None:
+        """Sync the `blocked` array with the current `blocks_movement` value of an entity on this map."""
+        if entity.blocks_movement == (entity in self._blocking_entities):
+            return
+        if entity.blocks_movement:
+            self._blocking_entities.add(entity)
+            self._change_blocked(self._entity_locations[entity], 1)
+        else:
+            self._blocking_entities.remove(entity)
+            self._change_blocked(self._entity_locations[entity], -1)
+
+    def _change_blocked(self, location: Tuple[int, int], amount: int) -> None:
+        """Change the blocking entity count of a tile and patch the cached path cost to match."""
+        blocked = int(self.blocked[location]) + amount
+        self.blocked[location] = blocked
+        if self._path_cost is not None and self._path_cost[location]:
+            self._path_cost[location] = 11 if blocked else 1
+
+    def on_tiles_changed(self) -> None:
+        """Must be called after `tiles` is modified so that data derived from the tiles is rebuilt."""
+        self._path_cost = None
+        self.tiles_version += 1
+
+    def get_path_cost(self) -> np.ndarray:
+        """Return the cost array used for pathfinding on this map.
+
+        The array is shared by every caller and must not be modified.
+        It is built once and afterwards kept in sync with `blocked` one tile at a time.
+        """
+        if self._path_cost is None:
+            metrics.count("path.cost_builds")
+            # Copy the walkable array.
+            cost = self.walkable.astype(np.int8)
+
+            # Add to the cost of positions with a blocking entity, unless the cost is already zero (blocking.)
+            # A lower number means more enemies will crowd behind each other in
+            # hallways.  A higher number means enemies will take longer paths in
+            # order to surround the player.
+            cost[(cost != 0) & (self.blocked != 0)] += 10
+            self._path_cost = cost
+        return self._path_cost
+
+    def update_entity_location(self, entity: Entity) -> None:
+        """Move an entity within the spatial index after its x and y have changed."""
+        old_location = self._entity_locations[entity]
+        new_location = entity.x, entity.y
+        if old_location == new_location:
+            return
+        self._entity_layer = None
+        if isinstance(entity, Actor) and entity in self._dormant_since:
+            self._remove_from_dormant_chunk(entity, old_location)
+            self._add_to_dormant_chunk(entity, new_location)
+        self._unindex_entity(entity, old_location)
+        self._entity_locations[entity] = new_location
+        self._entities_by_location.setdefault(new_location, []).append(entity)
+        if entity in self._blocking_entities:
+            self._change_blocked(old_location, -1)
+            self._change_blocked(new_location, 1)
+
+    def _unindex_entity(self, entity: Entity, location: Tuple[int, int]) -> None:
+        entities_here = self._entities_by_location[location]
+        entities_here.remove(entity)
+        if not entities_here:
+            del self._entities_by_location[location]
+
+    def get_entities_at_location(self, x: int, y: int) -> List[Entity]:
+        """Return the entities at this location, the returned list must not be modified."""
+        return self._entities_by_location.get((x, y), [])
 
     def get_blocking_entity_at_location(
         self,
         location_x: int,
         location_y: int,
     ) -> Optional[Entity]:
-        for entity in self.entities:
-            if entity.blocks_movement and entity.x == location_x and entity.y == location_y:
+        for entity in self.get_entities_at_location(location_x, location_y):
+            if entity.blocks_movement:
                 return entity
 
         return None
 
     def get_actor_at_location(self, x: int, y: int) -> Optional[Actor]:
-        for actor in self.actors:
-            if actor.x == x and actor.y == y:
-                return actor
+        for entity in self.get_entities_at_location(x, y):
+            if isinstance(entity, Actor) and entity.is_alive:
+                return entity
 
         return None
 
@@ -60,6 +412,11 @@ def in_bounds(self, x: int, y: int) -> bool:
         """Return True if x and y are inside of the bounds of this map."""
         return 0 <= x < self.width and 0 <= y < self.height
 
+    def mark_dirty(self, area: Tuple[slice, slice]) -> None:
+        """Mark an area of the map to be redrawn, this must be called after `visible` or `explored` is modified."""
+        self._dirty_windows.append(area)
+        self._entity_layer = None
+
     def render(self, console: Console) -> None:
         """
         Renders the map.
@@ -67,23 +424,52 @@ def render(self, console: Console) -> None:
         If a tile is in the "visible" array, then draw it with the "light" colors.
         If it isn't, but it's in the "explored" array, then draw it with the "dark" colors.
         Otherwise, the default is "SHROUD".
+
+        The tile graphics and the visible entities are cached between calls,
+        only the areas passed to mark_dirty are redrawn.
         """
-        console.rgb[0 : self.width, 0 : self.height] = np.select(
-            condlist=[self.visible, self.explored],
-            choicelist=[self.tiles["light"], self.tiles["dark"]],
-            default=tile_types.SHROUD,
-        )
+        if self._map_layer is None or self._map_layer_version != self.tiles_version:
+            self._map_layer = np.empty((self.width, self.height), dtype=tile_types.graphic_dt, order="F")
+            self._map_layer_version = self.tiles_version
+            self._dirty_windows = [(slice(None), slice(None))]
+        for area in self._dirty_windows:
+            self._map_layer[area] = tile_types.GRAPHICS[
+                self.tiles[area], self.explored[area] + self.visible[area].astype(np.int8)
+            ]
+        self._dirty_windows.clear()
+
+        console.rgb[0 : self.width, 0 : self.height] = self._map_layer
 
-        entities_sorted_for_rendering = sorted(self.entities, key=lambda x: x.render_order.value)
+        if self._entity_layer is None:
+            self._entity_layer = self._build_entity_layer()
+        x, y, ch, fg = self._entity_layer
+        console.rgb["ch"][x, y] = ch
+        console.rgb["fg"][x, y] = fg
 
-        for entity in entities_sorted_for_rendering:
-            if self.visible[entity.x, entity.y]:
-                console.print(x=entity.x, y=entity.y, string=entity.char, fg=entity.color)
+    def _build_entity_layer(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Return the positions, characters and colors of the top entity on every visible tile."""
+        window_x, window_y = self.fov_window  # All visible tiles are within this window.
+        visible_x, visible_y = np.nonzero(self.visible[self.fov_window])
+        visible_x += window_x.start
+        visible_y += window_y.start
+        top_entities = []
+        for x, y in zip(visible_x.tolist(), visible_y.tolist()):
+            entities_here = self.get_entities_at_location(x, y)
+            if entities_here:
+                top_entities.append(max(entities_here, key=lambda entity: entity.render_order.value))
+        return (
+            np.array([entity.x for entity in top_entities], dtype=np.intp),
+            np.array([entity.y for entity in top_entities], dtype=np.intp),
+            np.array([ord(entity.char) for entity in top_entities], dtype=np.int32),
+            np.array([entity.color for entity in top_entities], dtype=np.uint8).reshape(-1, 3),
+        )
 
 
 class GameWorld:
     """
     Holds the settings for the GameMap, and generates new maps when moving down the stairs.
+
+    The next floor is planned in a background thread while the current floor is played.
     """
 
     def __init__(
@@ -96,9 +482,13 @@ def __init__(
         room_min_size: int,
         room_max_size: int,
         current_floor: int = 0,
+        seed: Optional[int] = None,
     ):
         self.engine = engine
 
+        # Every floor is generated from this seed, a random seed is used if one isn't given.
+        self.seed = seed if seed is not None else random.getrandbits(64)
+
         self.map_width = map_width
         self.map_height = map_height
 
@@ -109,16 +499,74 @@ def __init__(
 
         self.current_floor = current_floor
 
-    def generate_floor(self) -> None:
-        from procgen import generate_dungeon
+        self._next_floor: Optional[concurrent.futures.Future[DungeonPlan]] = None  # The plan for current_floor + 1.
 
-        self.current_floor += 1
+    def __getstate__(self) -> Dict[str, Any]:
+        """Leave out the next floor, it is planned again by prepare_next_floor after loading."""
+        state = self.__dict__.copy()
+        state["_next_floor"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore from a pickle, filling in attributes which saves from older versions don't have."""
+        state.setdefault("seed", random.getrandbits(64))
+        state.setdefault("_next_floor", None)
+        self.__dict__.update(state)
 
-        self.engine.game_map = generate_dungeon(
+    def get_rng(self, floor_number: int, subsystem: str) -> random.Random:
+        """Return a new random number generator for one subsystem of a floor, such as "layout", "spawns" or "ai".
+
+        The same seed, floor and subsystem always give the same sequence of numbers,
+        so a floor can be generated again exactly from the seed and its floor number.
+        """
+        return random.Random(f"{self.seed}/{floor_number}/{subsystem}")
+
+    def _plan_floor(self, floor_number: int) -> DungeonPlan:
+        from procgen import plan_dungeon
+
+        return plan_dungeon(
             max_rooms=self.max_rooms,
             room_min_size=self.room_min_size,
             room_max_size=self.room_max_size,
             map_width=self.map_width,
             map_height=self.map_height,
-            engine=self.engine,
+            floor_number=floor_number,
+            layout_rng=self.get_rng(floor_number, "layout"),
+            spawn_rng=self.get_rng(floor_number, "spawns"),
         )
+
+    def prepare_next_floor(self) -> None:
+        """Start planning the floor below the current one in the background."""
+        if self._next_floor is not None:
+            self._next_floor.cancel()
+        self._next_floor = _floor_planner.submit(self._plan_floor, self.current_floor + 1)
+
+    def _take_next_floor(self) -> Optional[DungeonPlan]:
+        """Return the plan made by prepare_next_floor, or None if it was not started in time."""
+        next_floor, self._next_floor = self._next_floor, None
+        if next_floor is None or next_floor.cancel():
+            return None
+        # The plan is finished or in progress, waiting for it is never slower than starting over.
+        return next_floor.result()
+
+    def generate_floor(self) -> None:
+        from procgen import build_dungeon
+
+        start_time = time.perf_counter()
+        self.current_floor += 1
+
+        plan = self._take_next_floor()
+        if plan is None or plan.floor_number != self.current_floor:
+            metrics.count("world.floors_planned_on_descent")
+            plan = self._plan_floor(self.current_floor)
+        else:
+            metrics.count("world.floors_planned_in_background")
+
+        self.engine.game_map = build_dungeon(plan, self.engine)
+        metrics.add_time("world.floor_change", time.perf_counter() - start_time)
+
+        self.prepare_next_floor()
+
+
+# Plans floors in the background for GameWorld.prepare_next_floor.
+_floor_planner = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="floor_planner")
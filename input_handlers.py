@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING, Callable, Optional, Tuple, Union
-import os
 
 import tcod
 
@@ -9,6 +8,9 @@
 import actions
 import color
 import exceptions
+import journal
+import save_format
+import save_slots
 
 if TYPE_CHECKING:
     from engine import Engine
@@ -135,15 +137,19 @@ def handle_action(self, action: Optional[Action]) -> bool:
         if action is None:
             return False
 
+        command = journal.encode_action(action)  # Before the action changes the inventory.
         try:
             action.perform()
         except exceptions.Impossible as exc:
             self.engine.message_log.add_message(exc.args[0], color.impossible)
+            self.engine.record_command(command)
             return False  # Skip enemy turn on exceptions.
 
         self.engine.handle_enemy_turns()
+        self.engine.turn_count += 1
 
         self.engine.update_fov()
+        self.engine.record_command(command)
         return True
 
     def ev_mousemotion(self, event: tcod.event.MouseMotion) -> None:
@@ -270,12 +276,8 @@ def ev_keydown(self, event: tcod.event.KeyDown) -> Optional[ActionOrHandler]:
         index = key - tcod.event.K_a
 
         if 0 <= index <= 2:
-            if index == 0:
-                player.level.increase_max_hp()
-            elif index == 1:
-                player.level.increase_power()
-            else:
-                player.level.increase_defense()
+            player.level.increase_stat(index)
+            self.engine.record_command({"level_up": index})
         else:
             self.engine.message_log.add_message("Invalid entry.", color.invalid)
 
@@ -539,8 +541,9 @@ def ev_keydown(self, event: tcod.event.KeyDown) -> Optional[ActionOrHandler]:
 class GameOverEventHandler(EventHandler):
     def on_quit(self) -> None:
         """Handle exiting out of a finished game."""
-        if os.path.exists("savegame.sav"):
-            os.remove("savegame.sav")  # Deletes the active save file.
+        if self.engine.save_filename is not None:
+            save_format.unmap_save_file(self.engine.game_map)
+            save_slots.delete_slot(self.engine.save_filename)  # Deletes the active save file.
         raise exceptions.QuitWithoutSaving()  # Avoid saving a finished game.
 
     def ev_quit(self, event: tcod.event.Quit) -> None:
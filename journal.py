@@ -0,0 +1,200 @@
+"""An append-only journal of the commands given by the player since the last full save of the game.
+
+Saving the whole game takes time in proportion to the size of the world, appending one command to the journal only
+takes time in proportion to the command. A saved game is a checkpoint written by save_format, which is loaded and then
+brought up to date by replaying the commands in its journal. The game is deterministic, so replaying the same commands
+from the same checkpoint repeats what happened.
+
+The journal is a text file next to the checkpoint with one JSON object per line:
+- The first line is a header with the journal version, the seed of the game it belongs to, and the command count of
+  the last `checkpoint` written.
+- Every other line is an entry with the `sequence` number of a command, the `command` itself, and the state of the
+  player `after` the command which is checked during replay.
+
+Entries are numbered by Engine.command_count, so entries which are already part of the checkpoint are skipped.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Type
+import json
+import os
+
+from exceptions import SaveFormatError
+from metrics import metrics
+import actions
+
+if TYPE_CHECKING:
+    from engine import Engine
+    from entity import Actor
+
+JOURNAL_VERSION = 1
+
+# Every action the player can perform, by name.
+ACTION_CLASSES: Dict[str, Type[actions.Action]] = {
+    cls.__name__: cls
+    for cls in (
+        actions.BumpAction,
+        actions.DropItem,
+        actions.EquipAction,
+        actions.ItemAction,
+        actions.PickupAction,
+        actions.TakeStairsAction,
+        actions.WaitAction,
+    )
+}
+
+
+def journal_filename(filename: str) -> str:
+    """Return the filename of the journal for the save file `filename`."""
+    return f"{filename}.journal"
+
+
+def encode_action(action: actions.Action) -> Dict[str, Any]:
+    """Return a command which performs `action` when it is replayed.
+
+    This must be called before the action is performed, since items are referred to by their place in the inventory.
+    """
+    name = type(action).__name__
+    if name not in ACTION_CLASSES:
+        raise TypeError(f"{name} can not be journaled.")
+    command: Dict[str, Any] = {"action": name}
+    if isinstance(action, actions.ActionWithDirection):
+        command["dx"], command["dy"] = action.dx, action.dy
+    elif isinstance(action, (actions.ItemAction, actions.EquipAction)):
+        command["item"] = action.entity.inventory.items.index(action.item)
+        if isinstance(action, actions.ItemAction):
+            command["target"] = list(action.target_xy)
+    return command
+
+
+def decode_action(command: Dict[str, Any], player: Actor) -> actions.Action:
+    """Return the action of a command made by encode_action."""
+    try:
+        cls = ACTION_CLASSES[command["action"]]
+    except KeyError:
+        raise SaveFormatError(f"Unknown command in the journal: {command!r}")
+    if issubclass(cls, actions.ActionWithDirection):
+        return cls(player, command["dx"], command["dy"])
+    if issubclass(cls, actions.ItemAction):
+        return cls(player, player.inventory.items[command["item"]], tuple(command["target"]))
+    if issubclass(cls, actions.EquipAction):
+        return cls(player, player.inventory.items[command["item"]])
+    return cls(player)
+
+
+def player_state(engine: Engine) -> List[int]:
+    """Return a summary of the game state which is compared during replay to detect a replay going wrong."""
+    player = engine.player
+    return [engine.turn_count, engine.game_world.current_floor, player.x, player.y, player.fighter.hp]
+
+
+def _read(filename: str) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Return the header and entries of a journal, the header is None if there is no journal.
+
+    An incomplete last line, left by a write which was interrupted, is ignored.
+    """
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            lines = f.read().split("\n")
+    except FileNotFoundError:
+        return None, []
+    records = []
+    for line in lines:
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            break
+    if not records:
+        return None, []
+    header = records[0]
+    if header.get("journal") != JOURNAL_VERSION:
+        raise SaveFormatError(f"Journal version {header.get('journal')} is not supported.")
+    return header, records[1:]
+
+
+def latest_state(filename: str, seed: int) -> Optional[List[int]]:
+    """Return the player_state after the last command in the journal `filename`, if it has commands of this game."""
+    header, entries = _read(filename)
+    if header is None or header["seed"] != seed or not entries:
+        return None
+    after: List[int] = entries[-1]["after"]
+    return after
+
+
+class Journal:
+    """Appends the commands of one game to a journal file."""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+
+    def start(self, engine: Engine) -> bool:
+        """Prepare to record the commands of `engine`.
+
+        Entries of the same game are kept until a newer checkpoint is written, anything else is discarded.
+        Returns True if the checkpoint and this journal already hold the state of `engine`, as they do after loading.
+        """
+        header, entries = _read(self.filename)
+        if header is not None and header["seed"] == engine.game_world.seed:
+            if entries and entries[-1]["sequence"] == engine.command_count - 1:
+                self._rewrite(header, entries)  # Drops any incomplete last line, so that new entries can follow.
+                return True
+            if not entries and header.get("checkpoint") == engine.command_count:
+                return True
+        self._rewrite({"journal": JOURNAL_VERSION, "seed": engine.game_world.seed}, [])
+        return False
+
+    def append(self, engine: Engine, command: Dict[str, Any]) -> None:
+        """Append a command which was just performed by the player of `engine`."""
+        with metrics.time("journal.append"):
+            entry = {"sequence": engine.command_count, "command": command, "after": player_state(engine)}
+            with open(self.filename, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def sync(self) -> None:
+        """Wait until the appended commands are safely on disk."""
+        with open(self.filename, "a", encoding="utf-8") as f:
+            os.fsync(f.fileno())
+
+    def truncate(self, command_count: int) -> None:
+        """Remove the entries before `command_count`, after a checkpoint with that many commands was written."""
+        header, entries = _read(self.filename)
+        if header is not None:
+            header["checkpoint"] = command_count
+            self._rewrite(header, [entry for entry in entries if entry["sequence"] >= command_count])
+
+    def _rewrite(self, header: Dict[str, Any], entries: List[Dict[str, Any]]) -> None:
+        """Replace the journal file with a new one holding `entries`."""
+        temporary_filename = f"{self.filename}.tmp"
+        with open(temporary_filename, "w", encoding="utf-8") as f:
+            for record in [header, *entries]:
+                f.write(json.dumps(record, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary_filename, self.filename)
+
+
+def replay(engine: Engine, filename: str, handle_action: Callable[[actions.Action], bool]) -> int:
+    """Replay the commands in the journal `filename` which come after the checkpoint `engine` was loaded from.
+
+    `handle_action` performs an action the same way as when the player gave the command.
+    Returns the number of commands replayed.
+    """
+    header, entries = _read(filename)
+    if header is None or header["seed"] != engine.game_world.seed:
+        return 0  # There is no journal for this game.
+    replayed = 0
+    for entry in entries:
+        if entry["sequence"] < engine.command_count:
+            continue  # Already part of the checkpoint.
+        if entry["sequence"] != engine.command_count:
+            raise SaveFormatError(f"Command {engine.command_count} is missing from the journal.")
+        command = entry["command"]
+        if "level_up" in command:
+            engine.player.level.increase_stat(command["level_up"])
+            engine.record_command(command)
+        else:
+            handle_action(decode_action(command, engine.player))  # This records the command.
+        if player_state(engine) != entry["after"]:
+            raise SaveFormatError(f"Replaying command {entry['sequence']} of the journal did not match the game.")
+        replayed += 1
+    return replayed
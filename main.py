@@ -1,28 +1,49 @@
 #!/usr/bin/env python3
+import atexit
+import os
 import traceback
 
 import tcod
 
+from autosave import Autosave
+from metrics import metrics
 import color
 import exceptions
 import input_handlers
 import setup_game
 
+AUTOSAVE_INTERVAL = 100  # Turns between full saves of the game, 0 disables autosaving and the journal.
+SAVE_CODEC = "zlib-6"  # How saves are compressed, see save_format.CODECS and benchmarks/save_codecs.py.
+METRICS_VARIABLE = "ROGUELIKE_METRICS"  # If this environment variable is set then the metrics are printed on exit.
 
-def save_game(handler: input_handlers.BaseEventHandler, filename: str) -> None:
-    """If the current event handler has an active Engine then save it."""
-    if isinstance(handler, input_handlers.EventHandler):
-        handler.engine.save_as(filename)
+
+def save_game(handler: input_handlers.BaseEventHandler, autosave: Autosave) -> None:
+    """If the current event handler has an active Engine then save it to its save slot."""
+    autosave.wait()  # Don't let an older autosave finish after this save.
+    if isinstance(handler, input_handlers.EventHandler) and handler.engine.save_filename is not None:
+        if handler.engine.journal is not None:
+            handler.engine.journal.sync()  # The commands since the last autosave are already in the journal.
+        else:
+            handler.engine.save_as(handler.engine.save_filename, autosave.codec)
         print("Game saved.")
 
 
+def print_metrics() -> None:
+    """Print the counters and timings of the games hot paths, such as skipped FOV updates and floor changes."""
+    print(metrics.report() or "No metrics were recorded.")
+
+
 def main() -> None:
+    if os.environ.get(METRICS_VARIABLE):
+        atexit.register(print_metrics)
+
     screen_width = 80
     screen_height = 50
 
     tileset = tcod.tileset.load_tilesheet("data/dejavu10x10_gs_tc.png", 32, 8, tcod.tileset.CHARMAP_TCOD)
 
     handler: input_handlers.BaseEventHandler = setup_game.MainMenu()
+    autosave = Autosave(interval=AUTOSAVE_INTERVAL, codec=SAVE_CODEC)
 
     with tcod.context.new(
         columns=screen_width,
@@ -42,6 +63,8 @@ def main() -> None:
                     for event in tcod.event.wait():
                         context.convert_event(event)
                         handler = handler.handle_events(event)
+                    if isinstance(handler, input_handlers.EventHandler):
+                        autosave.update(handler.engine)
                 except Exception:  # Handle exceptions in game.
                     traceback.print_exc()  # Print error to stderr.
                     # Then print the error to the message log.
@@ -50,10 +73,10 @@ def main() -> None:
         except exceptions.QuitWithoutSaving:
             raise
         except SystemExit:  # Save and quit.
-            save_game(handler, "savegame.sav")
+            save_game(handler, autosave)
             raise
         except BaseException:  # Save on any other unexpected exception.
-            save_game(handler, "savegame.sav")
+            save_game(handler, autosave)
             raise
 
 
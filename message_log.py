@@ -1,16 +1,26 @@
-from typing import Iterable, List, Reversible, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Reversible, Tuple
 import textwrap
 
 import tcod
 
+from slotted import Slotted
 import color
 
 
-class Message:
+class Message(Slotted):
+    __slots__ = ("plain_text", "fg", "count", "_wrapped", "_wrapped_count")
+
     def __init__(self, text: str, fg: Tuple[int, int, int]):
         self.plain_text = text
         self.fg = fg
         self.count = 1
+        self._wrapped: Optional[Dict[int, List[str]]] = None  # Wrapped lines by width, made when first rendered.
+        self._wrapped_count = 1  # The count the wrapped lines were made with.
+
+    def __setstate__(self, state: Any) -> None:
+        self._wrapped = None
+        self._wrapped_count = 1
+        super().__setstate__(state)
 
     @property
     def full_text(self) -> str:
@@ -19,6 +29,19 @@ def full_text(self) -> str:
             return f"{self.plain_text} (x{self.count})"
         return self.plain_text
 
+    def wrapped_lines(self, width: int) -> List[str]:
+        """Return the full text wrapped to `width`.
+
+        The lines are cached for each width until the count changes.
+        """
+        if self._wrapped is None or self._wrapped_count != self.count:
+            self._wrapped = {}
+            self._wrapped_count = self.count
+        lines = self._wrapped.get(width)
+        if lines is None:
+            lines = self._wrapped[width] = list(MessageLog.wrap(self.full_text, width))
+        return lines
+
 
 class MessageLog:
     def __init__(self) -> None:
@@ -62,12 +85,12 @@ def render_messages(
         """Render the messages provided.
 
         The `messages` are rendered starting at the last message and working
-        backwards.
+        backwards until the area is full.
         """
         y_offset = height - 1
 
         for message in reversed(messages):
-            for line in reversed(list(cls.wrap(message.full_text, width))):
+            for line in reversed(message.wrapped_lines(width)):
                 console.print(x=x, y=y + y_offset, string=line, fg=message.fg)
                 y_offset -= 1
                 if y_offset < 0:
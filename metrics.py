@@ -0,0 +1,53 @@
+"""Counters and timers for measuring the cost of the games hot paths.
+
+The values are kept for the lifetime of the process and are not saved with the game.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterator
+import contextlib
+import time
+
+
+class Metrics:
+    def __init__(self) -> None:
+        self.counters: Dict[str, int] = {}
+        self.timings: Dict[str, float] = {}  # Total seconds spent in each timed section.
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Increase the counter `name` by `amount`."""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def add_time(self, name: str, seconds: float) -> None:
+        """Record one call of the timed section `name` which took `seconds`."""
+        self.count(name)
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    @contextlib.contextmanager
+    def time(self, name: str) -> Iterator[None]:
+        """Time the body of a with statement as one call of `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def reset(self) -> None:
+        """Clear all counters and timings."""
+        self.counters.clear()
+        self.timings.clear()
+
+    def report(self) -> str:
+        """Return the current values as a human readable table."""
+        lines = []
+        for name in sorted(self.counters):
+            calls = self.counters[name]
+            if name in self.timings:
+                total = self.timings[name]
+                lines.append(f"{name}: {calls} calls, {total * 1e3:.3f}ms total, {total / calls * 1e6:.2f}us each")
+            else:
+                lines.append(f"{name}: {calls}")
+        return "\n".join(lines)
+
+
+metrics = Metrics()
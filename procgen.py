@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Dict, Iterator, List, Tuple
+from typing import TYPE_CHECKING, Dict, List, Set, Tuple
+import functools
 import random
 
+import numpy as np
 import tcod
 
 from game_map import GameMap
@@ -11,7 +13,7 @@
 
 if TYPE_CHECKING:
     from engine import Engine
-    from entity import Entity
+    from entity_templates import EntityTemplate
 
 
 max_items_by_floor = [
@@ -25,14 +27,14 @@
     (6, 5),
 ]
 
-item_chances: Dict[int, List[Tuple[Entity, int]]] = {
+item_chances: Dict[int, List[Tuple[EntityTemplate, int]]] = {
     0: [(entity_factories.health_potion, 35)],
     2: [(entity_factories.confusion_scroll, 10)],
     4: [(entity_factories.lightning_scroll, 25), (entity_factories.sword, 5)],
     6: [(entity_factories.fireball_scroll, 25), (entity_factories.chain_mail, 15)],
 }
 
-enemy_chances: Dict[int, List[Tuple[Entity, int]]] = {
+enemy_chances: Dict[int, List[Tuple[EntityTemplate, int]]] = {
     0: [(entity_factories.orc, 80)],
     3: [(entity_factories.troll, 15)],
     5: [(entity_factories.troll, 30)],
@@ -52,29 +54,47 @@ def get_max_value_for_floor(max_value_by_floor: List[Tuple[int, int]], floor: in
     return current_value
 
 
-def get_entities_at_random(
-    weighted_chances_by_floor: Dict[int, List[Tuple[Entity, int]]],
-    number_of_entities: int,
-    floor: int,
-) -> List[Entity]:
-    entity_weighted_chances = {}
+class SpawnTable:
+    """The entities which can spawn on one floor, compiled into cumulative weights for fast sampling."""
 
-    for key, values in weighted_chances_by_floor.items():
-        if key > floor:
-            break
-        else:
-            for value in values:
-                entity = value[0]
-                weighted_chance = value[1]
+    def __init__(self, weighted_chances_by_floor: Dict[int, List[Tuple[EntityTemplate, int]]], floor: int):
+        entity_weighted_chances = {}
+
+        for key, values in weighted_chances_by_floor.items():
+            if key > floor:
+                break
+            else:
+                for value in values:
+                    entity = value[0]
+                    weighted_chance = value[1]
+
+                    entity_weighted_chances[entity] = weighted_chance
+
+        self.entities = list(entity_weighted_chances.keys())
+        self.cumulative_weights = np.cumsum(list(entity_weighted_chances.values()), dtype=np.int64)
 
-                entity_weighted_chances[entity] = weighted_chance
+    def sample(self, rng: np.random.Generator, number_of_entities: int) -> List[EntityTemplate]:
+        """Return `number_of_entities` entities chosen at random by their weights."""
+        if number_of_entities == 0 or not self.entities:
+            return []
+        rolls = rng.integers(0, self.cumulative_weights[-1], size=number_of_entities)
+        return [self.entities[index] for index in np.searchsorted(self.cumulative_weights, rolls, side="right")]
 
-    entities = list(entity_weighted_chances.keys())
-    entity_weighted_chance_values = list(entity_weighted_chances.values())
 
-    chosen_entities = random.choices(entities, weights=entity_weighted_chance_values, k=number_of_entities)
+class FloorSpawnTables:
+    """Everything needed to choose the entities for the rooms of one floor."""
 
-    return chosen_entities
+    def __init__(self, floor: int):
+        self.max_monsters = get_max_value_for_floor(max_monsters_by_floor, floor)
+        self.max_items = get_max_value_for_floor(max_items_by_floor, floor)
+        self.monsters = SpawnTable(enemy_chances, floor)
+        self.items = SpawnTable(item_chances, floor)
+
+
+@functools.lru_cache(maxsize=None)
+def get_floor_spawn_tables(floor: int) -> FloorSpawnTables:
+    """Return the spawn tables of a floor, these are compiled once per floor number."""
+    return FloorSpawnTables(floor)
 
 
 class RectangularRoom:
@@ -96,31 +116,73 @@ def inner(self) -> Tuple[slice, slice]:
         """Return the inner area of this room as a 2D array index."""
         return slice(self.x1 + 1, self.x2), slice(self.y1 + 1, self.y2)
 
+    @property
+    def outer(self) -> Tuple[slice, slice]:
+        """Return this room including its walls as a 2D array index."""
+        return slice(self.x1, self.x2 + 1), slice(self.y1, self.y2 + 1)
+
     def intersects(self, other: RectangularRoom) -> bool:
         """Return True if this room overlaps with another RectangularRoom."""
         return self.x1 <= other.x2 and self.x2 >= other.x1 and self.y1 <= other.y2 and self.y2 >= other.y1
 
 
-def place_entities(room: RectangularRoom, dungeon: GameMap, floor_number: int) -> None:
-    number_of_monsters = random.randint(0, get_max_value_for_floor(max_monsters_by_floor, floor_number))
-    number_of_items = random.randint(0, get_max_value_for_floor(max_items_by_floor, floor_number))
-
-    monsters: List[Entity] = get_entities_at_random(enemy_chances, number_of_monsters, floor_number)
-    items: List[Entity] = get_entities_at_random(item_chances, number_of_items, floor_number)
-
-    for entity in monsters + items:
-        x = random.randint(room.x1 + 1, room.x2 - 1)
-        y = random.randint(room.y1 + 1, room.y2 - 1)
-
-        if not any(entity.x == x and entity.y == y for entity in dungeon.entities):
-            entity.spawn(dungeon, x, y)
-
-
-def tunnel_between(start: Tuple[int, int], end: Tuple[int, int]) -> Iterator[Tuple[int, int]]:
-    """Return an L-shaped tunnel between these two points."""
+class DungeonPlan:
+    """The layout of a dungeon floor and the entities to spawn on it.
+
+    Planning does not touch the Engine, so it can be done in a background thread.
+    """
+
+    def __init__(self, map_width: int, map_height: int, floor_number: int):
+        self.map_width = map_width
+        self.map_height = map_height
+        self.floor_number = floor_number
+        self.tiles = np.full(
+            (map_width, map_height), fill_value=tile_types.wall, dtype=tile_types.tile_id_dt, order="F"
+        )
+        self.player_location = (0, 0)
+        self.downstairs_location = (0, 0)
+        self.spawns: List[Tuple[EntityTemplate, int, int]] = []  # Entity templates and their locations, in spawn order.
+        self.occupied_locations: Set[Tuple[int, int]] = set()  # Locations of the player and of planned spawns.
+
+
+def place_entities(rooms: List[RectangularRoom], plan: DungeonPlan, floor_number: int, rng: random.Random) -> None:
+    """Choose the monsters and items for every room of a floor in one batch, and add them to the plan."""
+    generator = np.random.default_rng(rng.getrandbits(64))
+    tables = get_floor_spawn_tables(floor_number)
+
+    number_of_monsters = generator.integers(0, tables.max_monsters, size=len(rooms), endpoint=True)
+    number_of_items = generator.integers(0, tables.max_items, size=len(rooms), endpoint=True)
+
+    monsters: List[EntityTemplate] = tables.monsters.sample(generator, int(number_of_monsters.sum()))
+    items: List[EntityTemplate] = tables.items.sample(generator, int(number_of_items.sum()))
+
+    # The room of each entity, the entities are sorted by room with monsters before items.
+    entity_rooms = np.concatenate(
+        [np.repeat(np.arange(len(rooms)), number_of_monsters), np.repeat(np.arange(len(rooms)), number_of_items)]
+    )
+    order = np.argsort(entity_rooms, kind="stable")
+    entities = monsters + items
+    entity_rooms = entity_rooms[order]
+
+    # Pick a random location inside of the room of each entity.
+    rooms_x1 = np.array([room.x1 for room in rooms], dtype=np.int64)[entity_rooms]
+    rooms_y1 = np.array([room.y1 for room in rooms], dtype=np.int64)[entity_rooms]
+    rooms_x2 = np.array([room.x2 for room in rooms], dtype=np.int64)[entity_rooms]
+    rooms_y2 = np.array([room.y2 for room in rooms], dtype=np.int64)[entity_rooms]
+    xs = generator.integers(rooms_x1 + 1, rooms_x2 - 1, endpoint=True)
+    ys = generator.integers(rooms_y1 + 1, rooms_y2 - 1, endpoint=True)
+
+    for index, x, y in zip(order.tolist(), xs.tolist(), ys.tolist()):
+        if (x, y) not in plan.occupied_locations:
+            plan.spawns.append((entities[index], x, y))
+            plan.occupied_locations.add((x, y))
+
+
+def tunnel_between(start: Tuple[int, int], end: Tuple[int, int], rng: random.Random) -> Tuple[np.ndarray, np.ndarray]:
+    """Return an L-shaped tunnel between these two points as a pair of index arrays."""
     x1, y1 = start
     x2, y2 = end
-    if random.random() < 0.5:  # 50% chance.
+    if rng.random() < 0.5:  # 50% chance.
         # Move horizontally, then vertically.
         corner_x, corner_y = x2, y1
     else:
@@ -128,62 +190,116 @@ def tunnel_between(start: Tuple[int, int], end: Tuple[int, int]) -> Iterator[Tup
         corner_x, corner_y = x1, y2
 
     # Generate the coordinates for this tunnel.
-    for x, y in tcod.los.bresenham((x1, y1), (corner_x, corner_y)).tolist():
-        yield x, y
-    for x, y in tcod.los.bresenham((corner_x, corner_y), (x2, y2)).tolist():
-        yield x, y
+    coordinates = np.concatenate(
+        [
+            tcod.los.bresenham((x1, y1), (corner_x, corner_y)),
+            tcod.los.bresenham((corner_x, corner_y), (x2, y2)),
+        ]
+    )
+    return coordinates[:, 0], coordinates[:, 1]
 
 
-def generate_dungeon(
+def plan_dungeon(
     max_rooms: int,
     room_min_size: int,
     room_max_size: int,
     map_width: int,
     map_height: int,
-    engine: Engine,
-) -> GameMap:
-    """Generate a new dungeon map."""
-    player = engine.player
-    dungeon = GameMap(engine, map_width, map_height, entities=[player])
+    floor_number: int,
+    layout_rng: random.Random,
+    spawn_rng: random.Random,
+) -> DungeonPlan:
+    """Plan a new dungeon floor, the plan is turned into a GameMap by build_dungeon.
+
+    `layout_rng` decides the rooms and tunnels, `spawn_rng` decides the entities placed in them.
+    """
+    plan = DungeonPlan(map_width, map_height, floor_number)
 
     rooms: List[RectangularRoom] = []
+    tunnels: List[Tuple[np.ndarray, np.ndarray]] = []
+    # The outer area of every room, a new room intersects another room if it overlaps this.
+    occupied = np.zeros((map_width, map_height), dtype=bool, order="F")
 
     center_of_last_room = (0, 0)
 
     for _ in range(max_rooms):
-        room_width = random.randint(room_min_size, room_max_size)
-        room_height = random.randint(room_min_size, room_max_size)
+        room_width = layout_rng.randint(room_min_size, room_max_size)
+        room_height = layout_rng.randint(room_min_size, room_max_size)
 
-        x = random.randint(0, dungeon.width - room_width - 1)
-        y = random.randint(0, dungeon.height - room_height - 1)
+        x = layout_rng.randint(0, map_width - room_width - 1)
+        y = layout_rng.randint(0, map_height - room_height - 1)
 
         # "RectangularRoom" class makes rectangles easier to work with
         new_room = RectangularRoom(x, y, room_width, room_height)
 
-        # Run through the other rooms and see if they intersect with this one.
-        if any(new_room.intersects(other_room) for other_room in rooms):
+        # Check if this room intersects with any other room.
+        if occupied[new_room.outer].any():
             continue  # This room intersects, so go to the next attempt.
         # If there are no intersections then the room is valid.
+        occupied[new_room.outer] = True
 
         # Dig out this rooms inner area.
-        dungeon.tiles[new_room.inner] = tile_types.floor
+        plan.tiles[new_room.inner] = tile_types.floor
 
         if len(rooms) == 0:
             # The first room, where the player starts.
-            player.place(*new_room.center, dungeon)
+            plan.player_location = new_room.center
+            plan.occupied_locations.add(new_room.center)
         else:  # All rooms after the first.
-            # Dig out a tunnel between this room and the previous one.
-            for x, y in tunnel_between(rooms[-1].center, new_room.center):
-                dungeon.tiles[x, y] = tile_types.floor
+            # Plan a tunnel between this room and the previous one, all tunnels are dug out at the end.
+            tunnels.append(tunnel_between(rooms[-1].center, new_room.center, layout_rng))
 
             center_of_last_room = new_room.center
 
-        place_entities(new_room, dungeon, engine.game_world.current_floor)
-
-        dungeon.tiles[center_of_last_room] = tile_types.down_stairs
-        dungeon.downstairs_location = center_of_last_room
-
         # Finally, append the new room to the list.
         rooms.append(new_room)
 
+    place_entities(rooms, plan, floor_number, spawn_rng)
+
+    if tunnels:
+        # Dig out every tunnel at once.
+        tunnels_x = np.concatenate([x for x, _ in tunnels])
+        tunnels_y = np.concatenate([y for _, y in tunnels])
+        plan.tiles[tunnels_x, tunnels_y] = tile_types.floor
+
+    plan.tiles[center_of_last_room] = tile_types.down_stairs
+    plan.downstairs_location = center_of_last_room
+
+    return plan
+
+
+def build_dungeon(plan: DungeonPlan, engine: Engine) -> GameMap:
+    """Create the GameMap for a planned floor, spawn its entities, and place the player on it."""
+    dungeon = GameMap(engine, plan.map_width, plan.map_height, rng=engine.game_world.get_rng(plan.floor_number, "ai"))
+    dungeon.tiles = plan.tiles
+    dungeon.downstairs_location = plan.downstairs_location
+    dungeon.on_tiles_changed()
+
+    engine.player.place(*plan.player_location, dungeon)
+    for entity, x, y in plan.spawns:
+        entity.spawn(dungeon, x, y)
+
     return dungeon
+
+
+def generate_dungeon(
+    max_rooms: int,
+    room_min_size: int,
+    room_max_size: int,
+    map_width: int,
+    map_height: int,
+    engine: Engine,
+) -> GameMap:
+    """Generate a new dungeon map from the seed of the engines GameWorld."""
+    floor_number = engine.game_world.current_floor
+    plan = plan_dungeon(
+        max_rooms=max_rooms,
+        room_min_size=room_min_size,
+        room_max_size=room_max_size,
+        map_width=map_width,
+        map_height=map_height,
+        floor_number=floor_number,
+        layout_rng=engine.game_world.get_rng(floor_number, "layout"),
+        spawn_rng=engine.game_world.get_rng(floor_number, "spawns"),
+    )
+    return build_dungeon(plan, engine)
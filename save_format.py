@@ -0,0 +1,677 @@
+"""Reading and writing save files.
+
+A save file starts with MAGIC, the length of its header, and a JSON header describing the sections which follow.
+The header also holds a "summary" of the game, such as the players level and a thumbnail of the map, which is read by
+read_summary without loading the rest of the file.  The sections are:
+
+- "tiles", "visible" and "explored" are the arrays of the current map, stored as raw buffers.  These come first and
+  start on a multiple of MAP_ALIGNMENT bytes into the file, so that they can be memory mapped.
+- "entities" is a table of the entities on the current map and the items held by them, including the components of
+  actors.  Their names are in "entity_names".
+- "messages" is a table of the message log, the message text is in "message_text".
+- "state" is everything else, pickled.  Entities, map arrays and the message list are pickled as references to the
+  sections above, and the entity indexes of the map are rebuilt from the entity table instead of being saved.
+
+Saving is split in two so that the game is only blocked for part of it: take_snapshot copies the mutable state of the
+engine into lists of attribute values and copies of its containers, then write_snapshot builds the sections from that
+copy, which can be done on another thread.
+
+Every section other than the map arrays is compressed with a codec from CODECS, which is recorded in the header of
+each section so that any codec can be loaded.
+
+The map arrays of a loaded game are memory mapped from the save file, so loading doesn't read the map and only the
+parts of it which are used are paged in.  The mapping is copy-on-write: changes made while playing never reach the
+file, they are only written by saving the game again, which replaces the whole file.
+
+Saves made before this format, which were an lzma compressed pickle of the Engine, can still be loaded.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, Dict, List, Optional, Tuple, Type
+import bz2
+import copyreg
+import functools
+import io
+import json
+import lzma
+import operator
+import os
+import pickle
+import struct
+import time
+import zlib
+
+import numpy as np
+
+from components.ai import BaseAI
+from components.equipment import Equipment
+from components.fighter import Fighter
+from components.inventory import Inventory
+from components.level import Level
+from entity import Actor, Entity, Item
+from game_map import GameMap
+from message_log import Message, MessageLog
+from render_order import RenderOrder
+from turn_scheduler import TurnScheduler
+import exceptions
+import tile_types
+
+if TYPE_CHECKING:
+    from engine import Engine
+
+MAGIC = b"TCODSAVE"
+FORMAT_VERSION = 1
+
+MAP_ARRAYS = ("tiles", "visible", "explored")
+THUMBNAIL_SIZE = (20, 10)  # The maximum width and height of the map thumbnail in the summary.
+MAP_ALIGNMENT = 4096  # The map array sections start on a multiple of this many bytes, the most common page size.
+COMPRESSED_SECTIONS = ("entities", "entity_names", "messages", "message_text", "state")
+# Saves which don't record the codec of their sections compressed these sections with "zlib-6".
+UNLABELED_COMPRESSED_SECTIONS = ("entity_names", "message_text", "state")
+
+
+class Codec:
+    """A compression method for the sections of a save file."""
+
+    def __init__(self, compress: Callable[[Any], bytes], decompress: Callable[[Any], bytes]):
+        self.compress = compress
+        self.decompress = decompress
+
+
+# Codecs by the name recorded in save files, the number in each name is the compression level or preset.
+CODECS: Dict[str, Codec] = {"none": Codec(bytes, bytes)}
+CODECS.update(
+    (f"zlib-{level}", Codec(functools.partial(zlib.compress, level=level), zlib.decompress)) for level in range(1, 10)
+)
+CODECS.update(
+    (f"bz2-{level}", Codec(functools.partial(bz2.compress, compresslevel=level), bz2.decompress))
+    for level in range(1, 10)
+)
+CODECS.update(
+    (f"lzma-{preset}", Codec(functools.partial(lzma.compress, preset=preset), lzma.decompress)) for preset in range(10)
+)
+DEFAULT_CODEC = "zlib-6"
+
+ENTITY_CLASSES: Tuple[Type[Entity], ...] = (Entity, Actor, Item)  # Indexed by the "kind" column of the entity table.
+# Entity attributes which are stored in the entity table, every other attribute is pickled with the state.
+TABLE_ATTRIBUTES = (
+    "parent",
+    "x",
+    "y",
+    "char",
+    "color",
+    "name",
+    "blocks_movement",
+    "render_order",
+    "speed",
+    "equipment",
+    "fighter",
+    "inventory",
+    "level",
+)
+# The columns of the entity table and the attributes they are taken from.
+ENTITY_COLUMNS = (
+    ("x", "x"),
+    ("y", "y"),
+    ("char", "char"),
+    ("color", "color"),
+    ("blocks_movement", "blocks_movement"),
+    ("render_order", "render_order"),
+)
+ACTOR_COLUMNS = (
+    ("speed", "speed"),
+    ("max_hp", "fighter.max_hp"),
+    ("hp", "fighter.hp"),
+    ("base_defense", "fighter.base_defense"),
+    ("base_power", "fighter.base_power"),
+    ("inventory_capacity", "inventory.capacity"),
+    ("current_level", "level.current_level"),
+    ("current_xp", "level.current_xp"),
+    ("level_up_base", "level.level_up_base"),
+    ("level_up_factor", "level.level_up_factor"),
+    ("xp_given", "level.xp_given"),
+    ("weapon", "equipment.weapon"),
+    ("armor", "equipment.armor"),
+)
+_UNSET = object()  # Stands in for the value of an entity attribute which was never set.
+
+entity_dt = np.dtype(
+    [
+        ("kind", np.uint8),
+        ("x", np.int32),
+        ("y", np.int32),
+        ("char", np.uint32),  # Unicode codepoint.
+        ("color", np.uint8, 3),
+        ("blocks_movement", bool),
+        ("render_order", np.uint8),
+        ("holder", np.int32),  # The index of the actor holding this item in its inventory, or -1 if it's on the map.
+        # The remaining columns are only used by actors.
+        ("speed", np.int32),
+        ("max_hp", np.int32),
+        ("hp", np.int32),
+        ("base_defense", np.int32),
+        ("base_power", np.int32),
+        ("inventory_capacity", np.int32),
+        ("current_level", np.int32),
+        ("current_xp", np.int32),
+        ("level_up_base", np.int32),
+        ("level_up_factor", np.int32),
+        ("xp_given", np.int32),
+        ("weapon", np.int32),  # The index of the equipped item, or -1.
+        ("armor", np.int32),
+    ]
+)
+
+message_dt = np.dtype(
+    [
+        ("fg", np.uint8, 3),
+        ("count", np.int32),
+        ("length", np.int32),  # Length of the UTF-8 encoded text.
+    ]
+)
+_get_message_row = operator.attrgetter("plain_text", "fg", "count")
+
+
+_pickled_attributes_by_class: Dict[type, Tuple[str, ...]] = {}
+
+
+def _pickled_attributes(cls: type) -> Tuple[str, ...]:
+    """Return the attributes of an entity class which are not stored in the entity table."""
+    if cls not in _pickled_attributes_by_class:
+        slots = [name for base in reversed(cls.__mro__) for name in base.__dict__.get("__slots__", ())]
+        _pickled_attributes_by_class[cls] = tuple(name for name in slots if name not in TABLE_ATTRIBUTES)
+    return _pickled_attributes_by_class[cls]
+
+
+# Every attribute which is pickled for some entity class.
+_PICKLED_ATTRIBUTE_NAMES = tuple(dict.fromkeys(name for cls in ENTITY_CLASSES for name in _pickled_attributes(cls)))
+
+
+def _reduce_state(obj: Any) -> Tuple[Any, ...]:
+    """Reduce an object for pickling with the copy of its attributes returned by its __getstate__."""
+    return copyreg.__newobj__, (type(obj),), obj.__getstate__()  # type: ignore[attr-defined]
+
+
+def _reduce_game_map(game_map: GameMap) -> Tuple[Any, ...]:
+    """Reduce a GameMap for pickling, with copies of the containers in its state.
+
+    Its entity indexes are left out, they are rebuilt with GameMap.index_entities after loading.
+    """
+    state = {key: value for key, value in game_map.__getstate__().items() if key not in GameMap.ENTITY_INDEXES}
+    state["_dormant_since"] = dict(game_map._dormant_since)
+    state["_dormant_by_chunk"] = {chunk: list(actors) for chunk, actors in game_map._dormant_by_chunk.items()}
+    state["_alert_until"] = dict(game_map._alert_until)
+    return copyreg.__newobj__, (type(game_map),), state  # type: ignore[attr-defined]
+
+
+def _reduce_scheduler(scheduler: TurnScheduler) -> Tuple[Any, ...]:
+    """Reduce a TurnScheduler for pickling, with copies of its queue and sequences."""
+    state = {**scheduler.__dict__, "_queue": list(scheduler._queue), "_sequences": dict(scheduler._sequences)}
+    return copyreg.__newobj__, (type(scheduler),), state  # type: ignore[attr-defined]
+
+
+def _copy_ai(ai: BaseAI) -> BaseAI:
+    """Return a copy of an AI with its own copy of the lists and AIs it holds, such as its path."""
+    copy = object.__new__(type(ai))
+    copy.__dict__ = ai.__dict__.copy()
+    for name, value in copy.__dict__.items():
+        if isinstance(value, list):
+            copy.__dict__[name] = list(value)
+        elif isinstance(value, BaseAI):
+            copy.__dict__[name] = _copy_ai(value)
+    return copy
+
+
+def _load_reference(kind: str, key: Any) -> Any:
+    """Stands in for the objects which _StatePickler replaces with references, _StateUnpickler resolves them."""
+    raise pickle.UnpicklingError("Save state references can only be loaded by load_engine.")
+
+
+class _StatePickler(pickle.Pickler):
+    """Pickles the engine, replacing objects stored in their own sections with references to those sections.
+
+    References are made in reducer_override instead of persistent_id, which is only called for instances of classes
+    other than the builtin types, so the many ints, strings and tuples in the state are pickled at full speed.
+    Objects which can change after the snapshot was taken are pickled from the reductions taken with it instead.
+    """
+
+    def __init__(
+        self,
+        file: io.BytesIO,
+        references: Dict[int, Tuple[str, Any]],
+        reductions: Dict[int, Tuple[Any, ...]],
+    ):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.references = references  # ("entity", index) or ("section", name) by the id() of the object replaced.
+        self.reductions = reductions  # Reductions by the id() of the object they were taken from.
+
+    def reducer_override(self, obj: Any) -> Any:
+        reference = self.references.get(id(obj))
+        if reference is not None:
+            return _load_reference, reference
+        return self.reductions.get(id(obj), NotImplemented)
+
+
+class _StateUnpickler(pickle.Unpickler):
+    def __init__(self, file: io.BytesIO, entities: List[Entity], sections: Dict[str, Any]):
+        super().__init__(file)
+        self.entities = entities
+        self.sections = sections
+
+    def find_class(self, module_name: str, global_name: str) -> Any:
+        if module_name == __name__ and global_name == _load_reference.__name__:
+            return self.load_reference
+        return super().find_class(module_name, global_name)
+
+    def load_reference(self, kind: str, key: Any) -> Any:
+        if kind == "entity":
+            return self.entities[key]
+        if kind == "section":
+            return self.sections[key]
+        raise pickle.UnpicklingError(f"Unknown reference: {kind!r}, {key!r}")
+
+
+def _collect_entities(game_map: GameMap) -> Tuple[List[Entity], List[int]]:
+    """Return the entities on the map followed by the items held by its actors, and the holder index of each."""
+    entities = game_map.entities_in_index_order()
+    holders = [-1] * len(entities)
+    for index, entity in enumerate(entities[:]):
+        if isinstance(entity, Actor):
+            entities += entity.inventory.items
+            holders += [index] * len(entity.inventory.items)
+    return entities, holders
+
+
+def _entity_table(entities: List[Entity], holders: List[int], columns: Dict[str, List[Any]]) -> np.ndarray:
+    """Return the entity table from the columns taken by take_snapshot."""
+    table = np.zeros(len(entities), dtype=entity_dt)
+    if not entities:
+        return table
+    table["kind"] = [ENTITY_CLASSES.index(type(entity)) for entity in entities]
+    table["holder"] = holders
+    table["x"] = columns["x"]
+    table["y"] = columns["y"]
+    table["char"] = [ord(char) for char in columns["char"]]
+    table["color"] = columns["color"]
+    table["blocks_movement"] = columns["blocks_movement"]
+    table["render_order"] = [render_order.value for render_order in columns["render_order"]]
+
+    actor_indexes = [index for index, entity in enumerate(entities) if isinstance(entity, Actor)]
+    if not actor_indexes:
+        return table
+    for name, _ in ACTOR_COLUMNS:
+        if name not in ("weapon", "armor"):
+            table[name][actor_indexes] = columns[name]
+    indexes = {id(entity): index for index, entity in enumerate(entities)}
+    table["weapon"][actor_indexes] = [indexes.get(id(item), -1) for item in columns["weapon"]]
+    table["armor"][actor_indexes] = [indexes.get(id(item), -1) for item in columns["armor"]]
+    return table
+
+
+def _entities_from_table(table: np.ndarray, names: List[str]) -> List[Entity]:
+    """Return new entities with the attributes from the entity table, the rest of their attributes are set later.
+
+    Entities which are on the map are left without a parent.
+    """
+    entities: List[Entity] = []
+    for row, name in zip(table.tolist(), names):
+        kind, x, y, char, color, blocks_movement, render_order, holder = row[:8]
+        cls = ENTITY_CLASSES[kind]
+        entity = cls.__new__(cls)
+        entity.x = x
+        entity.y = y
+        entity.char = chr(char)
+        entity.color = tuple(color)
+        entity.name = name
+        entity.blocks_movement = blocks_movement
+        entity.render_order = RenderOrder(render_order)
+        if holder >= 0:
+            inventory: Inventory = entities[holder].inventory
+            entity.parent = inventory
+            inventory.items.append(entity)
+        if isinstance(entity, Actor):
+            (
+                entity.speed,
+                max_hp,
+                hp,
+                base_defense,
+                base_power,
+                inventory_capacity,
+                current_level,
+                current_xp,
+                level_up_base,
+                level_up_factor,
+                xp_given,
+            ) = row[8:19]
+            entity.fighter = Fighter(hp=max_hp, base_defense=base_defense, base_power=base_power)
+            entity.fighter._hp = hp  # Set directly, the hp setter would kill actors with 0 hp again.
+            entity.inventory = Inventory(capacity=inventory_capacity)
+            entity.level = Level(current_level, current_xp, level_up_base, level_up_factor, xp_given)
+            entity.equipment = Equipment()
+            for component in (entity.fighter, entity.inventory, entity.level, entity.equipment):
+                component.parent = entity
+        entities.append(entity)
+
+    # Equipped items can come after their actor in the table, so equipment is set once every entity exists.
+    actor_indexes = np.flatnonzero(table["kind"] == ENTITY_CLASSES.index(Actor))
+    for index, weapon, armor in zip(
+        actor_indexes.tolist(), table["weapon"][actor_indexes].tolist(), table["armor"][actor_indexes].tolist()
+    ):
+        equipment: Equipment = entities[index].equipment  # type: ignore[attr-defined]
+        equipment.weapon = entities[weapon] if weapon >= 0 else None
+        equipment.armor = entities[armor] if armor >= 0 else None
+    return entities
+
+
+def _message_sections(rows: List[Tuple[str, Tuple[int, int, int], int]]) -> Tuple[np.ndarray, bytes]:
+    """Return the message table and text from the text, color and count of each message."""
+    texts = [text.encode("utf-8") for text, _, _ in rows]
+    table = np.zeros(len(rows), dtype=message_dt)
+    table["fg"] = [fg for _, fg, _ in rows] if rows else 0
+    table["count"] = [count for _, _, count in rows]
+    table["length"] = [len(text) for text in texts]
+    return table, b"".join(texts)
+
+
+def _messages_from_sections(table: np.ndarray, text: bytes) -> List[Message]:
+    messages: List[Message] = []
+    start = 0
+    for fg, count, length in zip(table["fg"].tolist(), table["count"].tolist(), table["length"].tolist()):
+        message = Message(text[start : start + length].decode("utf-8"), tuple(fg))
+        message.count = count
+        messages.append(message)
+        start += length
+    return messages
+
+
+class SaveSnapshot:
+    """The state of an Engine at one moment, taken by take_snapshot.
+
+    A snapshot holds copies of the mutable state of the engine, so it can be written by write_snapshot from another
+    thread while the game continues.  The live objects it refers to, such as `entities`, are only used for their id().
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        map_arrays: Dict[str, np.ndarray],
+        entities: List[Entity],
+        holders: List[int],
+        entity_names: List[str],
+        entity_columns: Dict[str, List[Any]],
+        entity_attributes: Dict[str, List[Any]],
+        message_rows: List[Tuple[str, Tuple[int, int, int], int]],
+        references: Dict[int, Tuple[str, Any]],
+        reductions: Dict[int, Tuple[Any, ...]],
+        summary: Dict[str, Any],
+    ):
+        self.engine = engine
+        self.map_arrays = map_arrays
+        self.entities = entities
+        self.holders = holders  # The index of the actor holding each entity, or -1.
+        self.entity_names = entity_names
+        self.entity_columns = entity_columns  # ENTITY_COLUMNS of every entity, followed by ACTOR_COLUMNS of the actors.
+        self.entity_attributes = entity_attributes  # The values of each pickled attribute of every entity, or _UNSET.
+        self.message_rows = message_rows  # The text, color and count of each message.
+        self.references = references  # References to the map arrays and the message log, see _StatePickler.
+        self.reductions = reductions  # Reductions of the engine, map, world, scheduler and random number generator.
+        self.summary = summary  # The summary for the header, without the thumbnail which is made by write_snapshot.
+
+
+def unmap_save_file(game_map: GameMap) -> None:
+    """Read the map arrays which are memory mapped from a save file into memory.
+
+    A file can't be replaced or deleted while it is mapped on some platforms, such as Windows.
+    This must be called before doing either to the save file a map was loaded from.
+    """
+    for name in MAP_ARRAYS:
+        if isinstance(getattr(game_map, name), np.memmap):
+            setattr(game_map, name, np.array(getattr(game_map, name), order="F"))
+
+
+def take_snapshot(engine: Engine) -> SaveSnapshot:
+    """Capture the state of an Engine for saving, this is the part of a save which must block the game.
+
+    Only the mutable state is copied here, building the sections from it and pickling it is left to write_snapshot.
+    """
+    game_map = engine.game_map
+    unmap_save_file(game_map)  # The snapshot is written over the file this map may have been loaded from.
+    entities, holders = _collect_entities(game_map)
+    live_map_arrays = {name: getattr(game_map, name) for name in MAP_ARRAYS}
+
+    references: Dict[int, Tuple[str, Any]] = {id(array): ("section", name) for name, array in live_map_arrays.items()}
+    references[id(engine.message_log)] = ("section", "message_log")
+    # The state of the entities is taken a column at a time, which makes far fewer objects for the garbage collector to
+    # go through than a row for each entity.
+    actors = [entity for entity in entities if isinstance(entity, Actor)]
+    entity_columns = {name: list(map(operator.attrgetter(attribute), entities)) for name, attribute in ENTITY_COLUMNS}
+    entity_columns.update(
+        (name, list(map(operator.attrgetter(attribute), actors))) for name, attribute in ACTOR_COLUMNS
+    )
+    entity_attributes = {
+        name: [getattr(entity, name, _UNSET) for entity in entities] for name in _PICKLED_ATTRIBUTE_NAMES
+    }
+    # AIs change as the game is played so they are copied, the other pickled components never change once made.
+    for values in entity_attributes.values():
+        for index, value in enumerate(values):
+            if isinstance(value, BaseAI):
+                values[index] = _copy_ai(value)
+
+    reductions: Dict[int, Tuple[Any, ...]] = {
+        id(engine): _reduce_state(engine),
+        id(engine.game_world): _reduce_state(engine.game_world),
+        id(game_map): _reduce_game_map(game_map),
+        id(game_map.scheduler): _reduce_scheduler(game_map.scheduler),
+        id(game_map.rng): (type(game_map.rng), (), game_map.rng.getstate()),
+    }
+
+    return SaveSnapshot(
+        engine=engine,
+        map_arrays={name: array.copy(order="F") for name, array in live_map_arrays.items()},
+        entities=entities,
+        holders=holders,
+        entity_names=[entity.name for entity in entities],
+        entity_columns=entity_columns,
+        entity_attributes=entity_attributes,
+        message_rows=list(map(_get_message_row, engine.message_log.messages)),
+        references=references,
+        reductions=reductions,
+        summary={
+            "player_name": engine.player.name,
+            "level": engine.player.level.current_level,
+            "floor": engine.game_world.current_floor,
+            "turn_count": engine.turn_count,
+            "timestamp": time.time(),
+            "seed": engine.game_world.seed,
+            "player_xy": [engine.player.x, engine.player.y],
+        },
+    )
+
+
+def _state_section(snapshot: SaveSnapshot) -> bytes:
+    """Pickle the state of a snapshot, with the attributes of its entities which are not in the entity table."""
+    entity_attributes: List[Dict[str, Any]] = []
+    for index, entity in enumerate(snapshot.entities):
+        values = ((name, snapshot.entity_attributes[name][index]) for name in _pickled_attributes(type(entity)))
+        entity_attributes.append({name: value for name, value in values if value is not _UNSET})
+    references = dict(snapshot.references)
+    references.update((id(entity), ("entity", index)) for index, entity in enumerate(snapshot.entities))
+    state = io.BytesIO()
+    _StatePickler(state, references, snapshot.reductions).dump((snapshot.engine, entity_attributes))
+    return state.getvalue()
+
+
+def _thumbnail(tiles: np.ndarray, explored: np.ndarray, player_xy: Tuple[int, int]) -> List[str]:
+    """Return a picture of the explored map no larger than THUMBNAIL_SIZE, as rows of characters.
+
+    Each character covers a block of tiles, "." if any explored tile in the block is walkable, "#" if the block has
+    only explored walls, and " " if nothing in it was explored.  The player is drawn as "@".
+    """
+    block_width = -(-tiles.shape[0] // THUMBNAIL_SIZE[0])
+    block_height = -(-tiles.shape[1] // THUMBNAIL_SIZE[1])
+    width, height = -(-tiles.shape[0] // block_width), -(-tiles.shape[1] // block_height)
+
+    def any_in_blocks(array: np.ndarray) -> np.ndarray:
+        padded = np.zeros((width * block_width, height * block_height), dtype=bool)
+        padded[: array.shape[0], : array.shape[1]] = array
+        blocks: np.ndarray = padded.reshape(width, block_width, height, block_height).max(axis=(1, 3))
+        return blocks
+
+    floors = any_in_blocks(tile_types.TILES["walkable"][tiles] & explored)
+    picture = np.where(floors, ".", np.where(any_in_blocks(explored), "#", " "))
+    picture[player_xy[0] // block_width, player_xy[1] // block_height] = "@"
+    return ["".join(row) for row in picture.T.tolist()]
+
+
+def write_snapshot(snapshot: SaveSnapshot, filename: str, codec: str = DEFAULT_CODEC) -> None:
+    """Write a snapshot to a save file, compressing its sections with the codec named `codec` from CODECS.
+
+    The file is written under a temporary name and then renamed over `filename`, so an interrupted save never leaves
+    a partly written file behind.
+    """
+    if codec not in CODECS:
+        raise ValueError(f"Unknown save codec: {codec!r}")
+    sections: Dict[str, bytes] = {name: array.tobytes(order="F") for name, array in snapshot.map_arrays.items()}
+    sections["entities"] = _entity_table(snapshot.entities, snapshot.holders, snapshot.entity_columns).tobytes()
+    sections["entity_names"] = "\0".join(snapshot.entity_names).encode("utf-8")
+    message_table, message_text = _message_sections(snapshot.message_rows)
+    sections["messages"] = message_table.tobytes()
+    sections["message_text"] = message_text
+    sections["state"] = _state_section(snapshot)
+
+    header: Dict[str, Any] = {
+        "version": FORMAT_VERSION,
+        "entity_count": len(snapshot.entities),
+        "map_entity_count": snapshot.holders.count(-1),
+        "summary": {
+            **snapshot.summary,
+            "thumbnail": _thumbnail(
+                snapshot.map_arrays["tiles"], snapshot.map_arrays["explored"], snapshot.summary["player_xy"]
+            ),
+        },
+        "sections": {},
+    }
+    offset = 0
+    padding: Dict[str, int] = {}  # Bytes written before each section to align it.
+    for name, data in sections.items():
+        if name in COMPRESSED_SECTIONS:
+            data = sections[name] = CODECS[codec].compress(data)
+        padding[name] = -offset % MAP_ALIGNMENT if name in MAP_ARRAYS else 0
+        offset += padding[name]
+        header["sections"][name] = {"offset": offset, "size": len(data)}
+        if name in COMPRESSED_SECTIONS:
+            header["sections"][name]["codec"] = codec
+        offset += len(data)
+    for name, array in snapshot.map_arrays.items():
+        header["sections"][name].update(dtype=array.dtype.str, shape=array.shape)
+
+    header_data = json.dumps(header).encode("utf-8")
+    # Pad the header with whitespace so that the sections start aligned, section offsets are from the end of the header.
+    header_data += b" " * (-(len(MAGIC) + 4 + len(header_data)) % MAP_ALIGNMENT)
+    temporary_filename = f"{filename}.tmp"
+    with open(temporary_filename, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header_data)))
+        f.write(header_data)
+        for name, data in sections.items():
+            f.write(bytes(padding[name]))
+            f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary_filename, filename)
+
+
+def save_engine(engine: Engine, filename: str, codec: str = DEFAULT_CODEC) -> None:
+    """Save an Engine to a file."""
+    write_snapshot(take_snapshot(engine), filename, codec)
+
+
+def _read_header(f: BinaryIO) -> Optional[Dict[str, Any]]:
+    """Read the header of an open save file, leaving the file at the start of the sections.
+
+    Returns None for saves from before this format, which have no header.
+    """
+    if f.read(len(MAGIC)) != MAGIC:
+        return None
+    (header_size,) = struct.unpack("<I", f.read(4))
+    header: Dict[str, Any] = json.loads(f.read(header_size))
+    return header
+
+
+def read_summary(filename: str) -> Optional[Dict[str, Any]]:
+    """Return the summary of the game in a save file without loading the game, or None if the save has no summary."""
+    with open(filename, "rb") as f:
+        header = _read_header(f)
+    if header is None:
+        return None
+    summary: Optional[Dict[str, Any]] = header.get("summary")
+    return summary
+
+
+def load_engine(filename: str, memory_map: bool = True) -> Engine:
+    """Load an Engine from a file.
+
+    If `memory_map` is False then the map arrays are read into memory instead of being memory mapped.
+    """
+    with open(filename, "rb") as f:
+        header = _read_header(f)
+        if header is None:
+            f.seek(0)
+            # A save from before this format, the classes in it convert their old attributes as they are unpickled.
+            legacy_engine: Engine = pickle.loads(lzma.decompress(f.read()))
+            return legacy_engine
+        if header["version"] != FORMAT_VERSION:
+            raise exceptions.SaveFormatError(f"Unsupported save file version: {header['version']}")
+        sections_start = f.tell()
+
+        def section(name: str) -> memoryview:
+            info = header["sections"][name]
+            f.seek(sections_start + info["offset"])
+            data = memoryview(bytearray(info["size"]))  # Writable, so that arrays made from it don't need copying.
+            f.readinto(data)
+            codec = info.get("codec", "zlib-6" if name in UNLABELED_COMPRESSED_SECTIONS else "none")
+            if codec == "none":
+                return data
+            if codec not in CODECS:
+                raise exceptions.SaveFormatError(f"Unsupported save codec: {codec}")
+            return memoryview(CODECS[codec].decompress(data))
+
+        loaded_sections: Dict[str, Any] = {}
+        for name in MAP_ARRAYS:
+            info = header["sections"][name]
+            if memory_map:
+                loaded_sections[name] = np.memmap(
+                    filename,
+                    dtype=info["dtype"],
+                    mode="c",  # Copy-on-write, the file is never modified.
+                    offset=sections_start + info["offset"],
+                    shape=tuple(info["shape"]),
+                    order="F",
+                )
+            else:
+                loaded_sections[name] = np.frombuffer(section(name), dtype=info["dtype"]).reshape(
+                    info["shape"], order="F"
+                )
+        message_table = np.frombuffer(section("messages"), dtype=message_dt)
+        message_text = bytes(section("message_text"))
+        entity_table = np.frombuffer(section("entities"), dtype=entity_dt)
+        entity_names = bytes(section("entity_names"))
+        state = section("state")
+
+    message_log = loaded_sections["message_log"] = MessageLog()
+    message_log.messages = _messages_from_sections(message_table, message_text)
+    names = entity_names.decode("utf-8").split("\0") if header["entity_count"] else []
+    entities = _entities_from_table(entity_table, names)
+
+    engine: Engine
+    entity_attributes: List[Dict[str, Any]]
+    engine, entity_attributes = _StateUnpickler(io.BytesIO(state), entities, loaded_sections).load()
+    for entity, attributes in zip(entities, entity_attributes):
+        for name, value in attributes.items():
+            setattr(entity, name, value)
+
+    map_entities = entities[: header["map_entity_count"]]
+    for entity in map_entities:
+        entity.parent = engine.game_map
+    engine.game_map.index_entities(map_entities)
+    return engine
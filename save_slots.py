@@ -0,0 +1,99 @@
+"""The saved games which can be continued from the main menu.
+
+Each game is saved to its own file in SAVE_DIRECTORY.  Slots are listed from the summaries in the save file headers,
+so no game has to be loaded to show the list.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+import datetime
+import glob
+import os
+import traceback
+
+import exceptions
+import journal
+import save_format
+
+SAVE_DIRECTORY = "saves"
+LEGACY_SAVE = "savegame.sav"  # The only save file of older versions.
+
+
+class SaveSlot:
+    """A save file and the summary of the game in it."""
+
+    def __init__(self, filename: str, summary: Optional[Dict[str, Any]]):
+        self.filename = filename
+        self.summary = summary  # None if the save is from a version without summaries.
+
+    @property
+    def timestamp(self) -> float:
+        """The time this game was last played, as seconds since the epoch."""
+        if self.summary is None:
+            return os.path.getmtime(self.filename)
+        return float(self.summary["timestamp"])
+
+    @property
+    def thumbnail(self) -> List[str]:
+        """A small picture of the explored map, see save_format.THUMBNAIL_SIZE."""
+        return self.summary["thumbnail"] if self.summary is not None else []
+
+    def describe(self) -> str:
+        """Return a one line description of this save."""
+        played = datetime.datetime.fromtimestamp(self.timestamp).strftime("%Y-%m-%d %H:%M")
+        if self.summary is None:
+            return f"{os.path.basename(self.filename)}, {played}"
+        return (
+            f"{self.summary['player_name']}, level {self.summary['level']}, floor {self.summary['floor']},"
+            f" turn {self.summary['turn_count']}, {played}"
+        )
+
+
+def read_slot(filename: str) -> SaveSlot:
+    """Return the slot of a save file, including the commands in its journal which are newer than its summary."""
+    summary = save_format.read_summary(filename)
+    if summary is not None:
+        journal_filename = journal.journal_filename(filename)
+        try:
+            state = journal.latest_state(journal_filename, summary["seed"])
+        except exceptions.SaveFormatError:
+            state = None
+        if state is not None:
+            turn_count, floor = state[:2]
+            summary.update(turn_count=turn_count, floor=floor, timestamp=os.path.getmtime(journal_filename))
+    return SaveSlot(filename, summary)
+
+
+def list_slots() -> List[SaveSlot]:
+    """Return every saved game, the most recently played first."""
+    filenames = sorted(glob.glob(os.path.join(SAVE_DIRECTORY, "*.sav")))
+    if os.path.exists(LEGACY_SAVE):
+        filenames.append(LEGACY_SAVE)
+    slots = []
+    for filename in filenames:
+        try:
+            slots.append(read_slot(filename))
+        except Exception:
+            traceback.print_exc()  # List the damaged save without details, loading it will report the error.
+            slots.append(SaveSlot(filename, None))
+    slots.sort(key=lambda slot: slot.timestamp, reverse=True)
+    return slots
+
+
+def new_slot_filename() -> str:
+    """Return the filename for the save of a new game."""
+    os.makedirs(SAVE_DIRECTORY, exist_ok=True)
+    name = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+    filename = os.path.join(SAVE_DIRECTORY, f"{name}.sav")
+    number = 1
+    while os.path.exists(filename):
+        number += 1
+        filename = os.path.join(SAVE_DIRECTORY, f"{name}-{number}.sav")
+    return filename
+
+
+def delete_slot(filename: str) -> None:
+    """Delete a save file and its journal."""
+    for path in (filename, journal.journal_filename(filename)):
+        if os.path.exists(path):
+            os.remove(path)
@@ -1,10 +1,7 @@
 """Handle the loading and initialization of game sessions."""
 from __future__ import annotations
 
-from typing import Optional
-import copy
-import lzma
-import pickle
+from typing import List, Optional
 import traceback
 
 from PIL import Image  # type: ignore
@@ -15,13 +12,19 @@
 import color
 import entity_factories
 import input_handlers
+import journal
+import save_format
+import save_slots
 
 # Load the background image.  Pillow returns an object convertable into a NumPy array.
 background_image = Image.open("data/menu_background.png")
 
 
-def new_game() -> Engine:
-    """Return a brand new game session as an Engine instance."""
+def new_game(seed: Optional[int] = None) -> Engine:
+    """Return a brand new game session as an Engine instance.
+
+    The dungeon is generated from `seed`, or from a random seed if it's None.
+    """
     map_width = 80
     map_height = 43
 
@@ -29,7 +32,7 @@ def new_game() -> Engine:
     room_min_size = 6
     max_rooms = 30
 
-    player = copy.deepcopy(entity_factories.player)
+    player = entity_factories.player.build()
 
     engine = Engine(player=player)
 
@@ -40,6 +43,7 @@ def new_game() -> Engine:
         room_max_size=room_max_size,
         map_width=map_width,
         map_height=map_height,
+        seed=seed,
     )
 
     engine.game_world.generate_floor()
@@ -47,8 +51,8 @@ def new_game() -> Engine:
 
     engine.message_log.add_message("Hello and welcome, adventurer, to yet another dungeon!", color.welcome_text)
 
-    dagger = copy.deepcopy(entity_factories.dagger)
-    leather_armor = copy.deepcopy(entity_factories.leather_armor)
+    dagger = entity_factories.dagger.build()
+    leather_armor = entity_factories.leather_armor.build()
 
     dagger.parent = player.inventory
     leather_armor.parent = player.inventory
@@ -63,10 +67,15 @@ def new_game() -> Engine:
 
 
 def load_game(filename: str) -> Engine:
-    """Load an Engine instance from a file."""
-    with open(filename, "rb") as f:
-        engine = pickle.loads(lzma.decompress(f.read()))
+    """Load an Engine instance from a file, and replay the commands in its journal.
+
+    The game will be saved back to the same file.
+    """
+    engine = save_format.load_engine(filename)
     assert isinstance(engine, Engine)
+    journal.replay(engine, journal.journal_filename(filename), input_handlers.EventHandler(engine).handle_action)
+    engine.save_filename = filename
+    engine.game_world.prepare_next_floor()
     return engine
 
 
@@ -93,7 +102,7 @@ def on_render(self, console: tcod.Console) -> None:
         )
 
         menu_width = 24
-        for i, text in enumerate(["[N] Play a new game", "[C] Continue last game", "[Q] Quit"]):
+        for i, text in enumerate(["[N] Play a new game", "[C] Continue a saved game", "[Q] Quit"]):
             console.print(
                 console.width // 2,
                 console.height // 2 - 2 + i,
@@ -108,14 +117,60 @@ def ev_keydown(self, event: tcod.event.KeyDown) -> Optional[input_handlers.BaseE
         if event.sym in (tcod.event.K_q, tcod.event.K_ESCAPE):
             raise SystemExit()
         elif event.sym == tcod.event.K_c:
-            try:
-                return input_handlers.MainGameEventHandler(load_game("savegame.sav"))
-            except FileNotFoundError:
+            slots = save_slots.list_slots()
+            if not slots:
                 return input_handlers.PopupMessage(self, "No saved game to load.")
+            return LoadGameMenu(self, slots)
+        elif event.sym == tcod.event.K_n:
+            engine = new_game()
+            engine.save_filename = save_slots.new_slot_filename()
+            return input_handlers.MainGameEventHandler(engine)
+
+        return None
+
+
+class LoadGameMenu(input_handlers.BaseEventHandler):
+    """List the saved games from their summaries, the highlighted game is loaded with Enter."""
+
+    def __init__(self, parent: input_handlers.BaseEventHandler, slots: List[save_slots.SaveSlot]):
+        self.parent = parent
+        self.slots = slots
+        self.cursor = 0
+
+    def on_render(self, console: tcod.Console) -> None:
+        """Render the list of saves over the dimmed parent, with the map thumbnail of the highlighted save below it."""
+        self.parent.on_render(console)
+        console.tiles_rgb["fg"] //= 8
+        console.tiles_rgb["bg"] //= 8
+
+        x, y, width, height = 2, 2, console.width - 4, console.height - 4
+        console.draw_frame(
+            x, y, width, height, title="Continue a saved game", clear=True, fg=color.white, bg=color.black
+        )
+
+        thumbnail_height = save_format.THUMBNAIL_SIZE[1]
+        rows = height - thumbnail_height - 3  # The list is separated from the thumbnail by a blank line.
+        first = max(0, self.cursor - rows + 1)
+        for row, slot in enumerate(self.slots[first : first + rows]):
+            if first + row == self.cursor:
+                fg, bg = color.black, color.white
+            else:
+                fg, bg = color.menu_text, color.black
+            console.print(x + 1, y + 1 + row, slot.describe()[: width - 2].ljust(width - 2), fg=fg, bg=bg)
+
+        thumbnail = self.slots[self.cursor].thumbnail
+        for row, line in enumerate(thumbnail):
+            console.print(x + (width - len(line)) // 2, y + height - 1 - thumbnail_height + row, line, fg=color.white)
+
+    def ev_keydown(self, event: tcod.event.KeyDown) -> Optional[input_handlers.BaseEventHandler]:
+        if event.sym in input_handlers.CURSOR_Y_KEYS:
+            self.cursor = max(0, min(self.cursor + input_handlers.CURSOR_Y_KEYS[event.sym], len(self.slots) - 1))
+        elif event.sym in input_handlers.CONFIRM_KEYS:
+            try:
+                return input_handlers.MainGameEventHandler(load_game(self.slots[self.cursor].filename))
             except Exception as exc:
                 traceback.print_exc()  # Print to stderr.
                 return input_handlers.PopupMessage(self, f"Failed to load save:\n{exc}")
-        elif event.sym == tcod.event.K_n:
-            return input_handlers.MainGameEventHandler(new_game())
-
+        elif event.sym == tcod.event.K_ESCAPE:
+            return self.parent
         return None
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+
+
+class Slotted:
+    """Base for classes which store their attributes in `__slots__` instead of a per-instance `__dict__`.
+
+    Every subclass must define `__slots__` with the attributes it adds.
+    """
+
+    __slots__ = ()
+
+    def __setstate__(self, state: Any) -> None:
+        """Restore this object from a pickle.
+
+        Saves made before these classes used `__slots__` pickled a plain attribute dictionary, which is also accepted.
+        """
+        attributes: Dict[str, Any] = {}
+        if isinstance(state, tuple):  # (__dict__ or None, slots) as returned by object.__getstate__.
+            attributes.update(state[0] or {})
+            attributes.update(state[1] or {})
+        else:
+            attributes.update(state)
+        for name, value in attributes.items():
+            setattr(self, name, value)
@@ -0,0 +1,32 @@
+"""Make the legacy save used by test_legacy_save.py.
+
+This has to be run with the game from before saves were split into sections, from a checkout of that version:
+
+    git worktree add ../legacy 6554cba
+    cd ../legacy && python ../tcod_tutorial_v2/tests/make_legacy_save.py ../tcod_tutorial_v2/tests/data/legacy_savegame.sav
+"""
+import random
+import sys
+
+import actions
+import exceptions
+import setup_game
+
+random.seed(1)
+engine = setup_game.new_game()
+player = engine.player
+for _ in range(400):
+    dx, dy = random.choice([(-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1), (1, 1)])
+    try:
+        if any(item.x == player.x and item.y == player.y for item in engine.game_map.items):
+            actions.PickupAction(player).perform()
+        else:
+            actions.BumpAction(player, dx, dy).perform()
+    except exceptions.Impossible:
+        continue
+    engine.handle_enemy_turns()
+    player.fighter.hp = player.fighter.max_hp  # Stay alive.
+    engine.update_fov()
+monsters = [actor for actor in engine.game_map.actors if actor is not player]
+monsters[0].fighter.hp = 0  # Leave a corpse on the map.
+engine.save_as(sys.argv[1])
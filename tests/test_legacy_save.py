@@ -0,0 +1,76 @@
+"""Saves made by the game from before saves were split into sections must still load and play."""
+from __future__ import annotations
+
+import os
+import pathlib
+import shutil
+
+from tcod.console import Console
+import numpy as np
+import pytest
+
+from engine import Engine
+import actions
+import exceptions
+import save_format
+import save_slots
+import setup_game
+import tile_types
+
+LEGACY_SAVE = os.path.join(os.path.dirname(__file__), "data", "legacy_savegame.sav")  # Made by make_legacy_save.py.
+
+
+@pytest.fixture
+def engine(tmp_path: pathlib.Path) -> Engine:
+    filename = str(tmp_path / "savegame.sav")
+    shutil.copy(LEGACY_SAVE, filename)
+    return setup_game.load_game(filename)
+
+
+def test_map_is_migrated(engine: Engine) -> None:
+    game_map = engine.game_map
+    assert game_map.tiles.dtype == tile_types.tile_id_dt
+    assert set(np.unique(game_map.tiles)) <= {tile_types.floor, tile_types.wall, tile_types.down_stairs}
+    assert game_map.walkable[engine.player.x, engine.player.y]
+    for entity in game_map.entities:
+        assert entity in game_map.get_entities_at_location(entity.x, entity.y)
+    assert game_map.blocked.sum() == sum(entity.blocks_movement for entity in game_map.entities)
+    monsters = [actor for actor in game_map.actors if actor is not engine.player]
+    assert monsters and all(monster in game_map.scheduler for monster in monsters)
+    assert list(game_map.dead_actors)
+
+
+def test_game_can_be_played(engine: Engine) -> None:
+    console = Console(80, 50, order="F")
+    engine.update_fov()
+    engine.render(console)
+    for dx, dy in [(1, 0), (0, 1), (-1, 0), (0, -1)] * 10:
+        try:
+            actions.BumpAction(engine.player, dx, dy).perform()
+        except exceptions.Impossible:
+            pass
+        engine.handle_enemy_turns()
+        engine.update_fov()
+        engine.render(console)
+    engine.game_world.generate_floor()
+    assert engine.game_world.current_floor == 2
+
+
+def test_migrated_game_can_be_saved(engine: Engine, tmp_path: pathlib.Path) -> None:
+    filename = str(tmp_path / "migrated.sav")
+    save_format.save_engine(engine, filename)
+    loaded = save_format.load_engine(filename)
+    assert (loaded.player.x, loaded.player.y) == (engine.player.x, engine.player.y)
+    assert len(loaded.game_map.entities) == len(engine.game_map.entities)
+    assert np.array_equal(loaded.game_map.tiles, engine.game_map.tiles)
+
+
+def test_legacy_save_is_listed_and_loads(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    shutil.copy(LEGACY_SAVE, tmp_path / save_slots.LEGACY_SAVE)
+    monkeypatch.chdir(tmp_path)
+    (slot,) = save_slots.list_slots()
+    assert slot.filename == save_slots.LEGACY_SAVE
+    assert slot.describe().startswith(save_slots.LEGACY_SAVE)
+    engine = setup_game.load_game(slot.filename)
+    assert engine.save_filename == save_slots.LEGACY_SAVE
+    assert engine.game_world.current_floor == 1
@@ -0,0 +1,52 @@
+"""Dormant actors are woken by the noise of fights and explosions."""
+from __future__ import annotations
+
+from components.ai import HostileEnemy
+from engine import Engine
+from entity import Actor
+from game_map import GameMap
+import actions
+import entity_factories
+import tile_types
+
+
+def new_engine() -> Engine:
+    """Return an engine on an open map with the player in a corner, nothing of the map is explored."""
+    engine = Engine(player=entity_factories.player.build())
+    engine.game_map = GameMap(engine, 60, 40)
+    engine.game_map.tiles[:] = tile_types.floor
+    engine.game_map.on_tiles_changed()
+    engine.player.place(2, 2, engine.game_map)
+    return engine
+
+
+def spawn_dormant_orc(engine: Engine, x: int, y: int) -> Actor:
+    orc = entity_factories.orc.spawn(engine.game_map, x, y)
+    engine.game_map.make_dormant(orc)
+    return orc
+
+
+def test_melee_wakes_nearby_actors() -> None:
+    engine = new_engine()
+    target = entity_factories.orc.spawn(engine.game_map, 3, 2)
+    near = spawn_dormant_orc(engine, 3 + actions.MELEE_NOISE_RADIUS, 2)
+    far = spawn_dormant_orc(engine, 4 + actions.MELEE_NOISE_RADIUS, 2)
+
+    actions.MeleeAction(engine.player, 1, 0).perform()
+
+    assert near in engine.game_map.scheduler
+    assert far not in engine.game_map.scheduler
+    assert isinstance(near.ai, HostileEnemy) and near.ai.path[-1] == (target.x, target.y)
+
+
+def test_woken_actors_stay_active() -> None:
+    engine = new_engine()
+    orc = spawn_dormant_orc(engine, 40, 30)  # Out of sight and outside the activity radius.
+    start = orc.x, orc.y
+
+    engine.game_map.wake_actors_near(35, 30, 10)
+    for _ in range(3):
+        engine.handle_enemy_turns()
+
+    assert orc in engine.game_map.scheduler
+    assert (orc.x, orc.y) != start  # The orc walks towards the noise instead of going dormant again.
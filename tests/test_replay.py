@@ -0,0 +1,97 @@
+"""A checkpoint followed by a replay of its journal must reproduce the game exactly."""
+from __future__ import annotations
+
+from typing import Any, List, Tuple
+import os
+import pathlib
+import random
+
+import pytest
+
+from autosave import Autosave
+from engine import Engine
+from entity import Actor
+import actions
+import input_handlers
+import setup_game
+
+COMMAND_COUNT = 300
+
+
+def play(engine: Engine, rng: random.Random, autosave: Autosave) -> None:
+    """Give COMMAND_COUNT random commands, mostly heading for the stairs, and autosave after each."""
+    handler = input_handlers.EventHandler(engine)
+    for _ in range(COMMAND_COUNT):
+        player = engine.player
+        game_map = engine.game_map
+        if player.level.requires_level_up:
+            choice = rng.randrange(3)
+            player.level.increase_stat(choice)
+            engine.record_command({"level_up": choice})
+            continue
+        roll = rng.random()
+        action: actions.Action
+        if (player.x, player.y) == game_map.downstairs_location and roll < 0.5:
+            action = actions.TakeStairsAction(player)
+        elif player.inventory.items and roll < 0.08:
+            item = rng.choice(player.inventory.items)
+            if item.equippable:
+                action = actions.EquipAction(player, item)
+            else:
+                targets = [
+                    actor for actor in game_map.actors if actor is not player and game_map.visible[actor.x, actor.y]
+                ]
+                action = actions.ItemAction(player, item, (targets[0].x, targets[0].y) if targets else None)
+        elif roll < 0.15:
+            action = actions.PickupAction(player)
+        elif roll < 0.6 and player.ai:
+            path = player.ai.get_path_to(*game_map.downstairs_location)
+            action = (
+                actions.BumpAction(player, path[0][0] - player.x, path[0][1] - player.y)
+                if path
+                else actions.WaitAction(player)
+            )
+        else:
+            action = actions.BumpAction(player, rng.choice([-1, 0, 1]), rng.choice([-1, 0, 1]))
+        handler.handle_action(action)
+        autosave.update(engine)
+    autosave.wait()
+
+
+def game_state(engine: Engine) -> Tuple[Any, ...]:
+    """Return everything about a game which a replay has to reproduce."""
+    player = engine.player
+    entities: List[Tuple[Any, ...]] = []
+    for entity in engine.game_map.entities_in_index_order():
+        state: Tuple[Any, ...] = (type(entity).__name__, entity.name, entity.x, entity.y, entity.blocks_movement)
+        if isinstance(entity, Actor):
+            state += (entity.fighter.hp, [item.name for item in entity.inventory.items], type(entity.ai).__name__)
+        entities.append(state)
+    return (
+        (player.x, player.y, player.fighter.hp, player.fighter.max_hp, player.fighter.power, player.fighter.defense),
+        (player.level.current_level, player.level.current_xp),
+        [item.name for item in player.inventory.items],
+        entities,
+        [(message.plain_text, message.fg, message.count) for message in engine.message_log.messages],
+        engine.game_world.current_floor,
+        engine.game_map.scheduler.time,
+        engine.game_map.rng.getstate(),
+        engine.turn_count,
+        engine.command_count,
+    )
+
+
+@pytest.mark.parametrize("interval", [1, 7, 50])
+@pytest.mark.parametrize("seed", [3, 11])
+def test_replay_reproduces_game(tmp_path: pathlib.Path, seed: int, interval: int) -> None:
+    engine = setup_game.new_game(seed=seed)
+    engine.player.fighter.max_hp = engine.player.fighter.hp = 10_000  # Live through every command.
+    engine.save_filename = str(tmp_path / "game.sav")
+    autosave = Autosave(interval=interval)
+    autosave.update(engine)
+
+    play(engine, random.Random(seed), autosave)
+    assert os.path.exists(engine.save_filename + ".journal")
+
+    loaded = setup_game.load_game(engine.save_filename)
+    assert game_state(loaded) == game_state(engine)
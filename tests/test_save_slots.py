@@ -0,0 +1,38 @@
+"""Save files must not stay mapped by a loaded game when they are deleted or replaced."""
+from __future__ import annotations
+
+import os
+import pathlib
+
+import numpy as np
+import pytest
+
+import exceptions
+import input_handlers
+import save_format
+import setup_game
+
+
+def test_finished_game_unmaps_save_before_deleting(tmp_path: pathlib.Path) -> None:
+    filename = str(tmp_path / "game.sav")
+    save_format.save_engine(setup_game.new_game(seed=1), filename)
+    engine = setup_game.load_game(filename)
+    assert all(isinstance(getattr(engine.game_map, name), np.memmap) for name in save_format.MAP_ARRAYS)
+
+    with pytest.raises(exceptions.QuitWithoutSaving):
+        input_handlers.GameOverEventHandler(engine).on_quit()
+
+    assert not any(isinstance(getattr(engine.game_map, name), np.memmap) for name in save_format.MAP_ARRAYS)
+    assert not os.path.exists(filename)
+
+
+def test_snapshot_unmaps_save(tmp_path: pathlib.Path) -> None:
+    filename = str(tmp_path / "game.sav")
+    save_format.save_engine(setup_game.new_game(seed=1), filename)
+    engine = setup_game.load_game(filename)
+    explored = np.array(engine.game_map.explored)
+
+    save_format.save_engine(engine, filename)
+
+    assert not isinstance(engine.game_map.explored, np.memmap)
+    assert np.array_equal(engine.game_map.explored, explored)
@@ -0,0 +1,59 @@
+"""A snapshot must save the game as it was when it was taken, however the game changes before it is written."""
+from __future__ import annotations
+
+from typing import Any, List, Tuple
+import pathlib
+import random
+
+from components.ai import HostileEnemy
+from engine import Engine
+from entity import Actor
+import actions
+import input_handlers
+import save_format
+import setup_game
+
+
+def saved_state(engine: Engine) -> Tuple[Any, ...]:
+    game_map = engine.game_map
+    entities: List[Tuple[Any, ...]] = []
+    for entity in game_map.entities_in_index_order():
+        state: Tuple[Any, ...] = (type(entity).__name__, entity.name, entity.x, entity.y)
+        if isinstance(entity, Actor):
+            state += (entity.fighter.hp, type(entity.ai).__name__, getattr(entity.ai, "path", None))
+        entities.append(state)
+    return (
+        entities,
+        [(message.plain_text, message.count) for message in engine.message_log.messages],
+        [(time, sequence, actor.name) for time, sequence, actor in game_map.scheduler._queue],
+        game_map.scheduler.time,
+        game_map.rng.getstate(),
+        game_map.explored.tolist(),
+        engine.turn_count,
+    )
+
+
+def test_snapshot_is_not_changed_by_playing(tmp_path: pathlib.Path) -> None:
+    engine = setup_game.new_game(seed=5)
+    expected_filename = str(tmp_path / "expected.sav")
+    save_format.save_engine(engine, expected_filename)
+    snapshot = save_format.take_snapshot(engine)
+
+    rng = random.Random(5)
+    handler = input_handlers.EventHandler(engine)
+    for _ in range(50):
+        handler.handle_action(actions.BumpAction(engine.player, rng.choice([-1, 0, 1]), rng.choice([-1, 0, 1])))
+        engine.update_fov()
+    for actor in engine.game_map.actors:
+        if isinstance(actor.ai, HostileEnemy):
+            actor.ai.path.append((0, 0))
+    engine.player.fighter.hp -= 1
+    engine.message_log.add_message("This happened after the snapshot.")
+    engine.game_map.rng.random()
+
+    snapshot_filename = str(tmp_path / "snapshot.sav")
+    save_format.write_snapshot(snapshot, snapshot_filename)
+    assert saved_state(save_format.load_engine(snapshot_filename)) == saved_state(
+        save_format.load_engine(expected_filename)
+    )
+    assert saved_state(save_format.load_engine(snapshot_filename)) != saved_state(engine)
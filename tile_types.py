@@ -22,19 +22,35 @@
 )
 
 
+# The integer type of the tile IDs stored in GameMap.tiles.
+tile_id_dt = np.uint8
+
+# SHROUD represents unexplored, unseen tiles
+SHROUD = np.array((ord(" "), (255, 255, 255), (0, 0, 0)), dtype=graphic_dt)
+
+# Every defined tile, indexed by tile ID.
+TILES = np.zeros(0, dtype=tile_dt)
+# The graphics of every tile ID when it is unexplored, explored but not visible, and visible.
+# Indexed with [tile_id, explored + visible].
+GRAPHICS = np.zeros((0, 3), dtype=graphic_dt)
+
+
 def new_tile(
     *,  # Enforce the use of keywords, so that parameter order doesn't matter.
     walkable: int,
     transparent: int,
     dark: Tuple[int, Tuple[int, int, int], Tuple[int, int, int]],
     light: Tuple[int, Tuple[int, int, int], Tuple[int, int, int]],
-) -> np.ndarray:
-    """Helper function for defining individual tile types"""
-    return np.array((walkable, transparent, dark, light), dtype=tile_dt)
-
+) -> int:
+    """Helper function for defining individual tile types, returns the ID of the new tile."""
+    global TILES, GRAPHICS
+    tile_id = len(TILES)
+    assert tile_id <= np.iinfo(tile_id_dt).max, "Too many tile types for tile_id_dt."
+    tile = np.array((walkable, transparent, dark, light), dtype=tile_dt)
+    TILES = np.append(TILES, tile)
+    GRAPHICS = np.append(GRAPHICS, np.array([[SHROUD, tile["dark"], tile["light"]]], dtype=graphic_dt), axis=0)
+    return tile_id
 
-# SHROUD represents unexplored, unseen tiles
-SHROUD = np.array((ord(" "), (255, 255, 255), (0, 0, 0)), dtype=graphic_dt)
 
 floor = new_tile(
     walkable=True,
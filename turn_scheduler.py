@@ -0,0 +1,68 @@
+"""Decides the order in which actors take their turns."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+import heapq
+
+if TYPE_CHECKING:
+    from entity import Actor
+
+NORMAL_SPEED = 100
+ACTION_COST = 100  # The time one action takes for an actor at normal speed.
+
+
+def action_delay(speed: int) -> int:
+    """Return the time an actor with this speed has to wait between actions.
+
+    This is the time it takes to gain ACTION_COST energy when gaining `speed` energy every NORMAL_SPEED time units.
+    """
+    return max(1, ACTION_COST * NORMAL_SPEED // speed)
+
+
+class TurnScheduler:
+    """A priority queue of actors ordered by the time of their next action.
+
+    Actors with the same time act in the order they were scheduled.
+    Removed actors are skipped lazily, so that removal does not need to search the queue.
+    """
+
+    def __init__(self) -> None:
+        self.time = 0  # The current game time.
+        self._queue: List[Tuple[int, int, Actor]] = []  # Heap of (time, sequence, actor) entries.
+        self._sequences: Dict[Actor, int] = {}  # The sequence number of each scheduled actors current entry.
+        self._next_sequence = 0
+
+    def __contains__(self, actor: Actor) -> bool:
+        return actor in self._sequences
+
+    def __len__(self) -> int:
+        return len(self._sequences)
+
+    def schedule(self, actor: Actor, delay: int = 0) -> None:
+        """Schedule an actor to act `delay` time units from now, replacing any earlier schedule for it."""
+        sequence = self._next_sequence
+        self._next_sequence += 1
+        self._sequences[actor] = sequence
+        heapq.heappush(self._queue, (self.time + delay, sequence, actor))
+
+    def unschedule(self, actor: Actor) -> None:
+        """Remove an actor from the schedule, does nothing if it isn't scheduled."""
+        self._sequences.pop(actor, None)
+
+    def pop_before(self, end_time: int) -> Optional[Actor]:
+        """Remove and return the next actor to act if it acts before `end_time`, otherwise return None.
+
+        The current time is advanced to the time of the returned actors action.
+        """
+        while self._queue:
+            time, sequence, actor = self._queue[0]
+            if self._sequences.get(actor) != sequence:
+                heapq.heappop(self._queue)  # Discard an entry which was unscheduled or replaced.
+                continue
+            if time >= end_time:
+                return None
+            heapq.heappop(self._queue)
+            del self._sequences[actor]
+            self.time = time
+            return actor
+        return None